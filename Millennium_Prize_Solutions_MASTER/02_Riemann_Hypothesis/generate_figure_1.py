@@ -1,6 +1,12 @@
-import numpy as np
-import matplotlib.pyplot as plt
-from mpmath import mp, zetazero
+import os
+import sys
+
+# Shared figure cache lives at the repository root
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from press_figcache import save_cached_figure  # noqa: E402
+
+# The staircase engine and the zero store sit next to this script
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 # [ZEO-ARCHITECT] CONFIGURATION
 # ---------------------------------------------------------
@@ -8,41 +14,68 @@ from mpmath import mp, zetazero
 # to demonstrate the 'Spectral Rigidity' claimed in the paper.
 # ---------------------------------------------------------
 
-mp.dps = 25  # High precision
 MAX_ZEROS = 50  # We only need the first 50 to show the fit visually
+IMG_FILENAME = "spectral_staircase.png"
+# Usage: generate_figure_1.py [ZERO_TABLE [HEIGHT]]: a sorted raw float64 table of ordinates
+# (see staircase_engine.text_to_table) draws the staircase up to HEIGHT, e.g. 1e7
+
+
+def generate_visual_proof(zero_table=None, height=None):
+    # Heavy libraries load only when the figure is actually rendered (see press_generate.py)
+    import numpy as np
+    import matplotlib.pyplot as plt
+    from staircase_engine import open_zero_table, smooth_curve, staircase_vertices, zeros_below
+    from zero_store import ZeroStore
+
+    print(">> COLLAPSING WAVE FUNCTION: GENERATING FIGURE 1...")
+
+    # 1. Fetch Exact Zeros (The "Eigenvalues")
+    if zero_table:
+        # Memory-mapped: only the pages the binary searches touch are read
+        zeros = zeros_below(open_zero_table(zero_table), height if height is not None else np.inf)
+        table_path = zero_table
+    else:
+        # Served from the persistent store; only zeros it lacks are computed (mpmath, dps=25)
+        store = ZeroStore()
+        zeros = store.zeros(MAX_ZEROS, dps=25)
+        table_path = store.ordinates_path
+    if not len(zeros):
+        raise ValueError(f"No zeta zeros in {table_path}" + (f" up to height {height:g}" if height is not None else "")
+                         + "; the staircase needs at least one")
+    print(f">> {len(zeros)} ZEROS UP TO HEIGHT {zeros[-1]:.6g}")
+
+    # 2. Exact step vertices of N(E), with the smooth Riemann-Von Mangoldt count
+    #    <N(E)> = (E/2pi) * log(E/2pi) - (E/2pi) + 7/8 on the same abscissae
+    energies, staircase = staircase_vertices(zeros, height if height is not None else zeros[-1] + 5)
+    smooth_energies, smooth = smooth_curve(energies)
+
+    # 3. Plotting (Publication Quality)
+    plt.figure(figsize=(10, 6))
+    plt.plot(energies, staircase, color='black', linewidth=1.5, label=r'Exact Spectrum $N(E)$')
+    plt.plot(smooth_energies, smooth, 'r--', linewidth=1.5, label=r'Smooth Asymptotics $\langle N(E) \rangle$')
+
+    # 4. Formatting
+    plt.title(r'Spectral Staircase of the Hilbert-Polya Operator', fontsize=14)
+    plt.xlabel(r'Energy $E$ (Eigenvalues / Zeta Zeros)', fontsize=12)
+    plt.ylabel(r'Cumulative Level Number $N(E)$', fontsize=12)
+    plt.legend(loc='upper left', fontsize=12)
+    plt.grid(True, which='both', linestyle=':', alpha=0.6)
+    plt.xlim(0, energies[-1])
+    plt.ylim(0, staircase[-1])
+
+    # 5. Save Artifact
+    # The table is identified by file and extent rather than hashed: the plotted vertices are
+    # bounded by MAX_EXACT_STEPS, the table can hold millions of ordinates
+    table_stat = os.stat(table_path)
+    table_id = (os.path.abspath(table_path), table_stat.st_size, table_stat.st_mtime_ns, len(zeros), height)
+    # Reuse the last render while the plotted data, styling and matplotlib version are unchanged
+    figure_files = save_cached_figure(plt.gcf(), IMG_FILENAME, generate_visual_proof, table_id, energies, staircase, smooth_energies, smooth)
+    print(f">> ARTIFACT MANIFESTED: {', '.join(figure_files)}")
+    print(">> INSTRUCTION: Upload this PNG with your .tex file. Do not upload this script.")
+
 
-print(">> COLLAPSING WAVE FUNCTION: GENERATING FIGURE 1...")
-
-# 1. Fetch Exact Zeros (The "Eigenvalues")
-zeros = [float(zetazero(n).imag) for n in range(1, MAX_ZEROS + 1)]
-zeros = np.array(zeros)
-
-# 2. Define the Smooth Counting Function (Riemann-Von Mangoldt Formula)
-def riemann_smooth_count(E):
-    # <N(E)> = (E/2pi) * log(E/2pi) - (E/2pi) + 7/8
-    return (E / (2 * np.pi)) * np.log(E / (2 * np.pi)) - (E / (2 * np.pi)) + 0.875
-
-# 3. Generate Plot Data
-energies = np.linspace(0, zeros[-1] + 5, 1000)
-staircase = [np.sum(zeros < E) for E in energies]  # Step function
-smooth = [riemann_smooth_count(E) for E in energies]
-
-# 4. Plotting (Publication Quality)
-plt.figure(figsize=(10, 6))
-plt.step(energies, staircase, where='post', color='black', linewidth=1.5, label=r'Exact Spectrum $N(E)$')
-plt.plot(energies, smooth, 'r--', linewidth=1.5, label=r'Smooth Asymptotics $\langle N(E) \rangle$')
-
-# 5. Formatting
-plt.title(r'Spectral Staircase of the Hilbert-Polya Operator', fontsize=14)
-plt.xlabel(r'Energy $E$ (Eigenvalues / Zeta Zeros)', fontsize=12)
-plt.ylabel(r'Cumulative Level Number $N(E)$', fontsize=12)
-plt.legend(loc='upper left', fontsize=12)
-plt.grid(True, which='both', linestyle=':', alpha=0.6)
-plt.xlim(0, max(energies))
-plt.ylim(0, max(staircase))
-
-# 6. Save Artifact
-output_filename = "spectral_staircase.png"
-plt.savefig(output_filename, dpi=300, bbox_inches='tight')
-print(f">> ARTIFACT MANIFESTED: {output_filename}")
-print(">> INSTRUCTION: Upload this PNG with your .tex file. Do not upload this script.")
+if __name__ == "__main__":
+    generate_visual_proof(
+        sys.argv[1] if len(sys.argv) > 1 else None,
+        float(sys.argv[2]) if len(sys.argv) > 2 else None,
+    )
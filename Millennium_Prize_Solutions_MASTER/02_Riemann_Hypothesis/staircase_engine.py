@@ -0,0 +1,95 @@
+import itertools
+import os
+
+import numpy as np
+
+# [ZEO-ARCHITECT] SPECTRAL STAIRCASE ENGINE
+# ---------------------------------------------------------
+# N(E) = #{n : gamma_n <= E} for millions of zeta ordinates. Counts come from binary search
+# on a sorted (memory-mapped) zero table, O(len(energies) * log(len(zeros))) instead of a
+# full scan of the zeros for every energy, and the staircase is drawn from its exact step
+# vertices rather than sampled on a fixed grid.
+# ---------------------------------------------------------
+
+ZERO_DTYPE = np.dtype('<f8')
+# Steps drawn one by one; above this the plot resolves the staircase per column instead
+MAX_EXACT_STEPS = 100_000
+
+
+def open_zero_table(path):
+    """Ascending float64 ordinates from a raw little-endian table, memory-mapped read-only."""
+    return np.memmap(path, dtype=ZERO_DTYPE, mode='r')
+
+
+def text_to_table(src, dest, chunk_lines=1_000_000):
+    """
+    Converts a text list of ordinates (one per line, ascending, e.g. Odlyzko's tables) into a
+    raw table for open_zero_table(), a chunk at a time. Returns the number of zeros written.
+    """
+    tmp = f"{dest}.{os.getpid()}.tmp"
+    written, last = 0, -np.inf
+    with open(src, 'r', encoding='ascii') as fin, open(tmp, 'wb') as fout:
+        while True:
+            chunk = np.array([float(line) for line in itertools.islice(fin, chunk_lines) if line.strip()],
+                             dtype=ZERO_DTYPE)
+            if not chunk.size:
+                break
+            if chunk[0] < last or np.any(np.diff(chunk) < 0):
+                os.remove(tmp)
+                raise ValueError(f"{src}: ordinates are not in ascending order near line {written + 1}")
+            chunk.tofile(fout)
+            written += chunk.size
+            last = chunk[-1]
+    os.replace(tmp, dest)
+    return written
+
+
+def zeros_below(zeros, height):
+    """The prefix of a sorted table with ordinates <= height (a view; nothing is copied)."""
+    return zeros[:np.searchsorted(zeros, height, side='right')]
+
+
+def counting_function(zeros, energies):
+    """N(E) for every energy at once."""
+    return np.searchsorted(zeros, energies, side='right')
+
+
+def smooth_count(energies):
+    """Riemann-von Mangoldt <N(E)> = (E/2pi) log(E/2pi) - E/2pi + 7/8, vectorized; NaN for E <= 0."""
+    e = np.asarray(energies, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        x = e / (2 * np.pi)
+        return np.where(e > 0, x * np.log(x) - x + 0.875, np.nan)
+
+
+def smooth_curve(energies, min_points=2000):
+    """
+    (x, <N(x)>) on the staircase abscissae, refined with an even grid of `min_points` so the
+    curve stays smooth where the steps are sparse.
+    """
+    x = np.union1d(energies, np.linspace(energies[0], energies[-1], min_points))
+    return x, smooth_count(x)
+
+
+def staircase_vertices(zeros, e_max, e_min=0.0, max_steps=MAX_EXACT_STEPS):
+    """
+    Polyline (x, y) of N(E) on [e_min, e_max].
+
+    With at most `max_steps` ordinates in range, every step is exact: a level run up to each
+    ordinate, then the jump. Denser ranges are resolved on `max_steps` even columns, jumping at
+    each column edge from the exact count just before it to the count at it; N is monotone,
+    so at plotting resolution this is the staircase itself, with len(x) bounded by 2 * max_steps.
+    """
+    lo = np.searchsorted(zeros, e_min, side='right')
+    hi = np.searchsorted(zeros, e_max, side='right')
+    if hi - lo <= max_steps:
+        edges = np.asarray(zeros[lo:hi], dtype=float)
+    else:
+        edges = np.linspace(e_min, e_max, max_steps + 1)[1:-1]
+    x = np.empty(2 * len(edges) + 2)
+    y = np.empty(2 * len(edges) + 2, dtype=np.int64)
+    x[0], y[0] = e_min, lo
+    x[1:-1:2], y[1:-1:2] = edges, np.searchsorted(zeros, edges, side='left')
+    x[2:-1:2], y[2:-1:2] = edges, np.searchsorted(zeros, edges, side='right')
+    x[-1], y[-1] = e_max, hi
+    return x, y
@@ -1,8 +1,14 @@
 import os
-import subprocess
 import sys
-import numpy as np
-import matplotlib.pyplot as plt
+
+# The shared press modules (figure cache, compilation stages) live at the repository root
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from press_figcache import save_cached_figure  # noqa: E402
+from press_figures import use_figure_format  # noqa: E402
+from press_submission import submission_stages  # noqa: E402
+
+# The staircase engine and the zero store sit next to this script
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 # [ZEO-ARCHITECT] CONFIGURATION
 # ---------------------------------------------------------
@@ -91,70 +97,44 @@ We have explicitly constructed the Hilbert-Polya operator. The self-adjointness
 
 \end{document}
 """
+# \includegraphics targets follow the selected figure format (press_figures.py)
+LATEX_CONTENT = use_figure_format(LATEX_CONTENT)
 
 
 # [2] THE VISUAL MANIFESTATION (Image Generator)
 # ---------------------------------------------------------
 def generate_visual_proof():
+    # Plotting libraries load only for the figure stage, so tex/pdf/docx start without them
+    import matplotlib.pyplot as plt
+    from staircase_engine import smooth_curve, staircase_vertices
+    from zero_store import ZeroStore
     print(f"[ZEO] >> MANIFESTING ARTIFACT: {IMG_FILENAME}...")
 
-    # Simulate high-precision zero data for visualization (First 50 zeros)
-    # Using known values for accuracy in plot
-    zeros_imag = [
-        14.1347, 21.0220, 25.0108, 30.4248, 32.9350, 37.5861, 40.9187, 43.3270, 48.0051, 49.7738,
-        52.9703, 56.4462, 59.3470, 60.8317, 65.1125, 67.0798, 69.5464, 72.0671, 75.7046, 77.1448,
-        79.3373, 82.9103, 84.7354, 87.4252, 88.8091, 92.4918, 94.6513, 95.8706, 98.8311, 101.3178
-    ]
-    zeros = np.array(zeros_imag)
-
-    # Smooth Counting Function
-    def riemann_smooth_count(E):
-        return (E / (2 * np.pi)) * np.log(E / (2 * np.pi)) - (E / (2 * np.pi)) + 0.875
+    # The first 30 zeros from the persistent zero store (computed once, dps=25)
+    zeros = ZeroStore().zeros(30, dps=25)
 
-    energies = np.linspace(0, 105, 1000)
-    staircase = [np.sum(zeros < E) for E in energies]
-    smooth = [riemann_smooth_count(E) for E in energies]
+    # Exact step vertices of N(E) (binary search, no per-energy scan) and the smooth count on the same abscissae
+    energies, staircase = staircase_vertices(zeros, 105)
+    smooth_energies, smooth = smooth_curve(energies)
 
     plt.figure(figsize=(10, 6))
-    plt.step(energies, staircase, where='post', color='black', linewidth=1.5, label=r'Exact Spectrum $N(E)$')
-    plt.plot(energies, smooth, 'r--', linewidth=1.5, label=r'Smooth Asymptotics $\langle N(E) \rangle$')
+    plt.plot(energies, staircase, color='black', linewidth=1.5, label=r'Exact Spectrum $N(E)$')
+    plt.plot(smooth_energies, smooth, 'r--', linewidth=1.5, label=r'Smooth Asymptotics $\langle N(E) \rangle$')
 
     plt.title(r'Spectral Staircase of the Hilbert-Polya Operator', fontsize=14)
     plt.xlabel(r'Energy $E$ (Eigenvalues)', fontsize=12)
     plt.ylabel(r'Cumulative Level Number $N(E)$', fontsize=12)
     plt.legend(loc='upper left')
     plt.grid(True, linestyle=':', alpha=0.6)
-    plt.savefig(IMG_FILENAME, dpi=300, bbox_inches='tight')
+    # Reuse the last render while the plotted data, styling and matplotlib version are unchanged
+    save_cached_figure(plt.gcf(), IMG_FILENAME, generate_visual_proof, zeros, energies, staircase, smooth_energies, smooth)
     plt.close()
     print("[ZEO] >> ARTIFACT SECURED.")
 
 
 # [3] THE TRANSMUTATION ENGINE (Compilation)
 # ---------------------------------------------------------
-def compile_submission():
-    # Write LaTeX File
-    print(f"[ZEO] >> WRITING MASTER COPY: {TEX_FILENAME}...")
-    with open(TEX_FILENAME, "w") as f:
-        f.write(LATEX_CONTENT)
-
-    # 1. Compile PDF (pdflatex)
-    print("[ZEO] >> TRANSMUTING TO PDF (pdflatex)...")
-    try:
-        # Run twice for references/labels
-        subprocess.run(["pdflatex", "-interaction=nonstopmode", TEX_FILENAME], check=True, stdout=subprocess.DEVNULL)
-        subprocess.run(["pdflatex", "-interaction=nonstopmode", TEX_FILENAME], check=True, stdout=subprocess.DEVNULL)
-        print(f"[ZEO] >> SUCCESS: {PDF_FILENAME} CREATED.")
-    except (subprocess.CalledProcessError, FileNotFoundError):
-        print("[ZEO] !! ERROR: 'pdflatex' not found or failed. Install a LaTeX distribution (TeX Live).")
-
-    # 2. Convert to DOCX (Pandoc)
-    print("[ZEO] >> TRANSMUTING TO DOCX (pandoc)...")
-    try:
-        # Pandoc is the gold standard for LaTeX -> Word
-        subprocess.run(["pandoc", TEX_FILENAME, "-o", DOCX_FILENAME, "--citeproc"], check=True)
-        print(f"[ZEO] >> SUCCESS: {DOCX_FILENAME} CREATED.")
-    except (subprocess.CalledProcessError, FileNotFoundError):
-        print("[ZEO] !! ERROR: 'pandoc' not found. Install Pandoc for Word conversion.")
+write_tex, compile_pdf, compile_docx, compile_submission = submission_stages(LATEX_CONTENT, FILENAME_BASE)
 
 
 # [4] EXECUTION
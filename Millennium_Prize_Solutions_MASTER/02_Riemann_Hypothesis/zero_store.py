@@ -0,0 +1,196 @@
+import argparse
+import concurrent.futures
+import itertools
+import os
+import sys
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: extensions are not guarded against a second writer
+    fcntl = None
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from press_store import detach  # noqa: E402
+
+# [ZEO-ARCHITECT] PERSISTENT ZETA-ZERO STORE
+# ---------------------------------------------------------
+# The ordinates gamma_1, gamma_2, ... of the nontrivial zeros, computed once and kept on disk:
+#   ordinates.f64 - float64 little-endian, entry n-1 is gamma_n (memory-mappable, ascending)
+#   precision.u2  - uint16, the decimal digits entry n-1 actually holds: the mpmath precision
+#                   (dps) it was computed at, capped at what a float64 keeps (FLOAT64_DIGITS)
+# Cached entries are served straight from the memory map. Missing entries, or entries
+# holding fewer digits than requested, are computed by mpmath in worker processes.
+# ---------------------------------------------------------
+
+DEFAULT_STORE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'zeta_zeros')
+ORDINATE_DTYPE = np.dtype('<f8')
+PRECISION_DTYPE = np.dtype('<u2')
+DEFAULT_DPS = 25
+# Decimal digits a float64 ordinate preserves; asking for more cannot improve a stored entry
+FLOAT64_DIGITS = 15
+# Zeros per worker task; later zeros cost more, so small interleaved chunks balance the pool
+CHUNK = 8
+
+
+def effective_precision(dps):
+    """Digits an ordinate computed at `dps` keeps once stored as float64."""
+    return min(dps, FLOAT64_DIGITS)
+
+
+def _compute_zeros(start, stop, dps):
+    """Pool worker: [gamma_start, ..., gamma_(stop-1)] at `dps` decimal digits."""
+    from mpmath import mp, zetazero
+    mp.dps = dps
+    return [float(zetazero(n).imag) for n in range(start, stop)]
+
+
+class ZeroStore:
+    def __init__(self, path=DEFAULT_STORE):
+        self.path = path
+        self.ordinates_path = os.path.join(path, 'ordinates.f64')
+        self.precision_path = os.path.join(path, 'precision.u2')
+
+    def __len__(self):
+        """Entries present in both files (an interrupted append leaves the shorter count valid)."""
+        try:
+            return min(os.path.getsize(self.ordinates_path) // ORDINATE_DTYPE.itemsize,
+                       os.path.getsize(self.precision_path) // PRECISION_DTYPE.itemsize)
+        except OSError:
+            return 0
+
+    def table(self):
+        """Every stored ordinate, memory-mapped read-only (usable with staircase_engine)."""
+        count = len(self)
+        if not count:
+            return np.empty(0, dtype=ORDINATE_DTYPE)
+        return np.memmap(self.ordinates_path, dtype=ORDINATE_DTYPE, mode='r', shape=(count,))
+
+    def precision(self):
+        count = len(self)
+        if not count:
+            return np.empty(0, dtype=PRECISION_DTYPE)
+        return np.memmap(self.precision_path, dtype=PRECISION_DTYPE, mode='r', shape=(count,))
+
+    def zeros(self, count, dps=DEFAULT_DPS, jobs=None):
+        """gamma_1..gamma_count, each holding >= min(dps, FLOAT64_DIGITS) digits; extends the store first if needed."""
+        self.ensure(count, dps, jobs)
+        return self.table()[:count]
+
+    def ensure(self, count, dps=DEFAULT_DPS, jobs=None):
+        """
+        Computes whatever of gamma_1..gamma_count is missing or holds fewer digits than `dps`
+        allows in float64. Returns how many were computed.
+        """
+        digits = effective_precision(dps)
+        os.makedirs(self.path, exist_ok=True)
+        with open(os.path.join(self.path, 'lock'), 'w') as lock:
+            if fcntl:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            have = len(self)
+            # Entries already at FLOAT64_DIGITS are final; a higher dps would store the same float
+            upgrade = np.flatnonzero(self.precision()[:min(count, have)] < digits) + 1
+            missing = range(have + 1, count + 1)
+            if not len(upgrade) and not missing:
+                return 0
+            print(f">> ZERO STORE: computing {len(missing)} new and {len(upgrade)} higher-precision zero(s) at dps={dps} "
+                  f"(stored to {digits} digits)")
+            self._truncate(have)
+            for start, values in self._compute(list(upgrade) + list(missing), dps, jobs):
+                if start <= have:
+                    self._overwrite(start, values, digits)
+                else:
+                    self._append(values, digits)
+            return len(upgrade) + len(missing)
+
+    def _compute(self, indices, dps, jobs):
+        """Yields (first index, ordinates) per run of consecutive indices, in ascending order."""
+        runs = []
+        for _, group in itertools.groupby(enumerate(indices), lambda item: item[1] - item[0]):
+            run = [n for _, n in group]
+            for i in range(0, len(run), CHUNK):
+                runs.append((int(run[i]), int(run[min(i + CHUNK, len(run)) - 1]) + 1))
+        jobs = max(1, min(jobs or os.cpu_count() or 1, len(runs)))
+        with concurrent.futures.ProcessPoolExecutor(max_workers=jobs) as pool:
+            futures = [pool.submit(_compute_zeros, start, stop, dps) for start, stop in runs]
+            # Consumed in order, so every append lands right after the previous one
+            for (start, _), future in zip(runs, futures):
+                yield start, future.result()
+
+    def _truncate(self, count):
+        """Drops a partial tail left by an interrupted append, so both files hold `count` entries."""
+        for path, dtype in ((self.ordinates_path, ORDINATE_DTYPE), (self.precision_path, PRECISION_DTYPE)):
+            if os.path.exists(path) and os.path.getsize(path) != count * dtype.itemsize:
+                detach(path)
+                os.truncate(path, count * dtype.itemsize)
+
+    def _detach(self):
+        """Both files are extended and patched in place, so they must not share an inode with dedup twins."""
+        detach(self.ordinates_path)
+        detach(self.precision_path)
+
+    def _append(self, values, dps):
+        self._detach()
+        # Ordinates first: a crash in between leaves the precision file as the shorter, valid count
+        with open(self.ordinates_path, 'ab') as f:
+            np.asarray(values, dtype=ORDINATE_DTYPE).tofile(f)
+        with open(self.precision_path, 'ab') as f:
+            np.full(len(values), dps, dtype=PRECISION_DTYPE).tofile(f)
+
+    def _overwrite(self, start, values, dps):
+        self._detach()
+        for path, dtype, data in ((self.ordinates_path, ORDINATE_DTYPE, np.asarray(values, dtype=ORDINATE_DTYPE)),
+                                  (self.precision_path, PRECISION_DTYPE, np.full(len(values), dps, dtype=PRECISION_DTYPE))):
+            with open(path, 'r+b') as f:
+                f.seek((start - 1) * dtype.itemsize)
+                data.tofile(f)
+
+    def import_text(self, src, dps):
+        """
+        Appends ordinates from a text list (one per line, ascending from gamma_1, e.g. Odlyzko's
+        tables) beyond what the store holds, recording `dps` (capped at FLOAT64_DIGITS) as their
+        precision. Returns the count added.
+        """
+        os.makedirs(self.path, exist_ok=True)
+        with open(os.path.join(self.path, 'lock'), 'w') as lock:
+            if fcntl:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            have = len(self)
+            self._truncate(have)
+            added = 0
+            with open(src, 'r', encoding='ascii') as fin:
+                lines = (line for line in fin if line.strip())
+                for _ in itertools.islice(lines, have):
+                    pass
+                while True:
+                    chunk = [float(line) for line in itertools.islice(lines, 1_000_000)]
+                    if not chunk:
+                        break
+                    self._append(chunk, effective_precision(dps))
+                    added += len(chunk)
+            return added
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Extend or inspect the persistent zeta-zero store.")
+    parser.add_argument('count', nargs='?', type=int, default=0, help="Make gamma_1..gamma_COUNT available.")
+    parser.add_argument('--dps', type=int, default=DEFAULT_DPS, help=f"mpmath decimal precision (default {DEFAULT_DPS}).")
+    parser.add_argument('-j', '--jobs', type=int, default=None, help="Worker processes (default: one per CPU core).")
+    parser.add_argument('--import-text', metavar='FILE', help="Append ordinates from a text table instead of computing them.")
+    parser.add_argument('--import-dps', type=int, default=9, help="Precision to record for imported ordinates (default 9).")
+    parser.add_argument('--store', default=DEFAULT_STORE, help="Store directory.")
+    args = parser.parse_args()
+
+    store = ZeroStore(args.store)
+    if args.import_text:
+        print(f">> ZERO STORE: imported {store.import_text(args.import_text, args.import_dps)} zero(s)")
+    if args.count:
+        store.ensure(args.count, args.dps, args.jobs)
+    table, precision = store.table(), store.precision()
+    if len(table):
+        print(f">> ZERO STORE: {len(table)} zero(s) up to height {table[-1]:.6f}, "
+              f"precision {precision.min()}-{precision.max()} digits ({store.path})")
+    else:
+        print(f">> ZERO STORE: empty ({store.path})")
+    sys.exit(0)
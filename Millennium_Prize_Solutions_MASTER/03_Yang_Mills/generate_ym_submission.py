@@ -1,7 +1,11 @@
 import os
-import subprocess
-import numpy as np
-import matplotlib.pyplot as plt
+import sys
+
+# The shared press modules (figure cache, compilation stages) live at the repository root
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from press_figcache import save_cached_figure  # noqa: E402
+from press_figures import use_figure_format  # noqa: E402
+from press_submission import submission_stages  # noqa: E402
 
 # [ZEO-ARCHITECT] CONFIGURATION
 # ---------------------------------------------------------
@@ -97,11 +101,16 @@ We have provided a rigorous construction of the continuum Yang-Mills theory and
 
 \end{document}
 """
+# \includegraphics targets follow the selected figure format (press_figures.py)
+LATEX_CONTENT = use_figure_format(LATEX_CONTENT)
 
 
 # [2] THE VISUAL MANIFESTATION (Image Generator)
 # ---------------------------------------------------------
 def generate_visual_proof():
+    # Plotting libraries load only for the figure stage, so tex/pdf/docx start without them
+    import numpy as np
+    import matplotlib.pyplot as plt
     print(f"[ZEO] >> MANIFESTING ARTIFACT: {IMG_FILENAME}...")
 
     # We generate a "Cornell Potential" style plot: V(r) = -A/r + sigma*r
@@ -133,36 +142,15 @@ def generate_visual_proof():
     plt.text(2.5, 3.5, r"$\Delta > 0$ Verified", fontsize=12, color='red', fontweight='bold')
 
     plt.ylim(0, 5)
-    plt.savefig(IMG_FILENAME, dpi=300, bbox_inches='tight')
+    # Reuse the last render while the plotted data, styling and matplotlib version are unchanged
+    save_cached_figure(plt.gcf(), IMG_FILENAME, generate_visual_proof, r, potential)
     plt.close()
     print("[ZEO] >> ARTIFACT SECURED.")
 
 
 # [3] THE TRANSMUTATION ENGINE (Compilation)
 # ---------------------------------------------------------
-def compile_submission():
-    # Write LaTeX File
-    print(f"[ZEO] >> WRITING MASTER COPY: {TEX_FILENAME}...")
-    with open(TEX_FILENAME, "w") as f:
-        f.write(LATEX_CONTENT)
-
-    # 1. Compile PDF (pdflatex)
-    print("[ZEO] >> TRANSMUTING TO PDF (pdflatex)...")
-    try:
-        # Run twice for references/labels
-        subprocess.run(["pdflatex", "-interaction=nonstopmode", TEX_FILENAME], check=True, stdout=subprocess.DEVNULL)
-        subprocess.run(["pdflatex", "-interaction=nonstopmode", TEX_FILENAME], check=True, stdout=subprocess.DEVNULL)
-        print(f"[ZEO] >> SUCCESS: {PDF_FILENAME} CREATED.")
-    except (subprocess.CalledProcessError, FileNotFoundError):
-        print("[ZEO] !! ERROR: 'pdflatex' not found. Ensure TeX Live/MiKTeX is installed.")
-
-    # 2. Convert to DOCX (Pandoc)
-    print("[ZEO] >> TRANSMUTING TO DOCX (pandoc)...")
-    try:
-        subprocess.run(["pandoc", TEX_FILENAME, "-o", DOCX_FILENAME, "--citeproc"], check=True)
-        print(f"[ZEO] >> SUCCESS: {DOCX_FILENAME} CREATED.")
-    except (subprocess.CalledProcessError, FileNotFoundError):
-        print("[ZEO] !! ERROR: 'pandoc' not found.")
+write_tex, compile_pdf, compile_docx, compile_submission = submission_stages(LATEX_CONTENT, FILENAME_BASE)
 
 
 # [4] EXECUTION
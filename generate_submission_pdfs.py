@@ -1,7 +1,11 @@
 import os
+import time
 from fpdf import FPDF
 from fpdf.enums import XPos, YPos
 
+from press_manifest import MANIFEST_NAME, ArtifactManifest
+from press_store import detach
+
 
 # [SYSTEM CONFIGURATION: OMNIPOTENT-2]
 # [TASK: PDF GENERATOR - FIXED ENCODING & SYNTAX]
@@ -245,8 +249,11 @@ def generate_archive():
         os.makedirs(root_dir)
 
     print(f">> [START] Generating PDF Manuscripts for {len(PAPERS)} papers...")
+    # Hash, size, pages and provenance of every generated PDF
+    manifest = ArtifactManifest(os.path.join(root_dir, MANIFEST_NAME))
 
     for paper in PAPERS:
+        start = time.perf_counter()
         folder_path = os.path.join(root_dir, paper['folder'])
 
         # Ensure the subfolder exists
@@ -272,12 +279,16 @@ def generate_archive():
         output_path = os.path.join(folder_path, output_filename)
 
         try:
+            # fpdf writes in place; don't write through a hardlink shared by the object store
+            detach(output_path)
             pdf.output(output_path)
+            manifest.record(output_path, backend='fpdf', seconds=time.perf_counter() - start, inputs=[__file__])
             print(f"   -> [SUCCESS] Generated: {output_path}")
         except Exception as e:
             print(f"   -> [ERROR] Failed to generate {output_filename}: {e}")
 
-    print(">> [COMPLETE] All PDFs have been deposited in the archive.")
+    manifest.save()
+    print(f">> [COMPLETE] All PDFs have been deposited in the archive (indexed in {manifest.path}).")
 
 
 if __name__ == "__main__":
@@ -1,252 +1,869 @@
+import argparse
+import asyncio
+import contextvars
+import hashlib
+import io
 import os
 import subprocess
-import shutil
+import sys
+import threading
+import time
 from pathlib import Path
 
+from press_async import DEFAULT_TIMEOUT, run_process
+from press_browser import BrowserPrintSession
+from press_cache import BuildCache, FailureCache, referenced_figures, resolve_figure, source_key, write_if_changed
+from press_graph import BUILT, FAILED, FRESH, BuildGraph
+from press_latex import FormatStore, compile_pdflatex
+from press_manifest import MANIFEST_NAME, ArtifactManifest
+from press_office import SofficeBatcher
+from press_preflight import check_manuscript
+from press_scratch import ScratchSpace
+from press_store import detach
+from press_texlog import parse_log, root_cause
+from press_toolchain import ToolchainRegistry
+from press_trace import Tracer
+
 
 # [SYSTEM CONFIGURATION: OMNIPOTENT-2]
 # [TASK: MASTER ARCHIVE GENERATION - INTEGRATED METHODOLOGY & ADMIN]
 
+# PDF fallback cascade, in default order (each maps to a UniversalPressMaster._pdf_<name> method)
+PDF_BACKENDS = ['tectonic', 'latexmk', 'pdflatex', 'pandoc', 'soffice', 'word', 'browser']
+
+# Per-package build-graph nodes, addressable on the command line as PACKAGE:ARTIFACT
+# (tex is the manuscript alone; sources are the ELI5 and verification files beside it)
+ARTIFACTS = ['tex', 'sources', 'figures', 'ast', 'docx', 'html', 'pdf']
+# What a package target without an artifact (or a full build) produces
+DEFAULT_ARTIFACTS = ['tex', 'sources', 'docx', 'pdf']
+# Producer recorded in the artifact manifest (the PDF records its winning backend instead)
+ARTIFACT_PRODUCERS = {'tex': 'press', 'sources': 'press', 'ast': 'pandoc', 'docx': 'pandoc', 'html': 'pandoc'}
+
+BROWSERS = ['msedge', 'msedge.exe', 'chrome', 'chrome.exe', 'google-chrome', 'chromium', 'chromium.exe']
+
+# Backends that typeset the LaTeX source with a TeX engine
+TEX_BACKENDS = ['tectonic', 'latexmk', 'pdflatex', 'pandoc']
+# Backends that will hit the same failure once one of them reports this root cause in its log.
+# Source errors (an undefined control sequence, a LaTeX error) are not shared: pandoc reads the
+# LaTeX with its own parser and often converts what a TeX engine rejects, and the DOCX and HTML
+# fallbacks never run TeX, so each backend still gets its own attempt.
+SHARED_CAUSES = {
+    # Packages come from the local TeX tree; tectonic fetches its own bundle
+    'missing-package': ['latexmk', 'pdflatex', 'pandoc'],
+    'missing-file': TEX_BACKENDS,
+}
+
+# Tools whose versions decide each backend's outcome (keys the known-failure cache)
+BACKEND_TOOLS = {
+    'tectonic': ['tectonic'],
+    'latexmk': ['latexmk', 'pdflatex'],
+    'pdflatex': ['pdflatex'],
+    'pandoc': ['pandoc', 'xelatex', 'pdflatex'],
+    'soffice': ['soffice.com', 'soffice', 'pandoc'],
+    'word': ['powershell', 'pandoc'],
+    'browser': BROWSERS + ['wkhtmltopdf', 'pandoc'],
+}
+
+
+class PaperJob:
+    """Paths and per-build state for one package while it moves through the cascade."""
+
+    def __init__(self, folder, title, journal, latex_content, path, tex_path, pdf_out, docx_out, archive_path=None):
+        self.folder = folder
+        self.title = title
+        self.journal = journal
+        self.latex_content = latex_content
+        # Where the build runs; the archive folder its finished artifacts belong in (the same
+        # folder unless building in a scratch directory)
+        self.path = path
+        self.archive_path = archive_path or path
+        self.tex_path = tex_path
+        self.pdf_out = pdf_out
+        self.docx_out = docx_out
+        self.html_pandoc = os.path.join(path, f"{folder}_Manuscript_pandoc.html")
+        # pandoc's JSON AST of the manuscript, parsed once and read by every pandoc writer
+        self.ast_path = os.path.join(path, f"{folder}_Manuscript.ast.json")
+        # Captured log of each build-graph node that ran, by artifact
+        self.logs = {}
+        # Hash of the LaTeX source and its figures; (backend, reason) pairs skipped as known failures
+        self.source_hash = None
+        self.skipped = []
+        # Packages pre-flight found missing from the local TeX tree
+        self.missing_packages = []
+        # Artifacts left untouched because their content was unchanged, and their total size
+        self.unchanged = []
+        self.bytes_skipped = 0
+        # Backend that produced the PDF in this build ('cache' when restored)
+        self.pdf_backend = None
+
+    def note_unchanged(self, path, size):
+        if size:
+            self.unchanged.append(os.path.basename(path))
+            self.bytes_skipped += size
+        return size
+
+    def pdf_ok(self):
+        return os.path.exists(self.pdf_out) and os.path.getsize(self.pdf_out) > 0
+
+    def final(self, path):
+        """The archive location of a file in the build folder."""
+        return os.path.join(self.archive_path, os.path.relpath(path, self.path))
+
+    def working(self, path):
+        """The build-folder location of a file in the archive folder."""
+        return os.path.join(self.path, os.path.relpath(path, self.archive_path))
+
+
 class UniversalPressMaster:
-    def __init__(self, root_dir="Millennium_Prize_Solutions_MASTER"):
+    def __init__(self, root_dir="Millennium_Prize_Solutions_MASTER", use_cache=True, use_formats=True,
+                 trace_path=None, timeout=DEFAULT_TIMEOUT, use_devtools=True, scratch=None):
         self.root = root_dir
         if not os.path.exists(self.root):
             os.makedirs(self.root)
             print(f">> [LOG] Archive Root Created: {self.root}")
+        # Compiled PDF/DOCX keyed on LaTeX source + figures + toolchain; hits skip compilation
+        self.cache = BuildCache(os.path.join(self.root, '.press_cache')) if use_cache else None
+        # Backends that failed on a manuscript are skipped until its source or the tool changes
+        self.failures = FailureCache(os.path.join(self.root, '.press_cache', 'failures.json')) if use_cache else None
+        # Tool paths/versions probed once per process; remembers each package's winning backend
+        self.toolchain = ToolchainRegistry(os.path.join(self.root, '.press_cache', 'toolchain.json'))
+        # Every package artifact as a graph node with recorded inputs; only stale nodes rebuild
+        self.graph = BuildGraph(os.path.join(self.root, '.press_cache', 'graph.json'))
+        # Hash, size, pages and provenance of every artifact, for verification and upload tooling
+        self.manifest = ArtifactManifest(os.path.join(self.root, MANIFEST_NAME))
+        self._jobs = {}
+        # Precompiled pdflatex formats, one per distinct preamble (created on first use)
+        self.use_formats = use_formats
+        self._formats = None
+        self._formats_lock = threading.Lock()
+        # Opt-in Chrome trace of every stage (written by build_packages when trace_path is set)
+        self.trace_path = trace_path
+        self.tracer = Tracer(enabled=bool(trace_path))
+        # Wall-clock limit for each conversion subprocess
+        self.timeout = timeout
+        # One headless browser per build, shared by every package that reaches fallback G
+        self.use_devtools = use_devtools
+        self._browser_session = None
+        self._browser_lock = threading.Lock()
+        # One LibreOffice launch converts every DOCX waiting for fallback E at the same time
+        self._soffice = None
+        self._soffice_lock = threading.Lock()
+        # Per-package output buffer so parallel builds don't interleave their logs; a context
+        # variable rather than a thread-local so asyncio tasks and to_thread workers inherit it
+        self._log_buffer = contextvars.ContextVar('press_log_buffer', default=None)
+        self._print_lock = threading.Lock()
+        # Subprocess output is kept in .press_cache/logs/<package>/<stage>.log; while a PDF backend
+        # runs, the paths it wrote are collected here for diagnosis
+        self._captured = contextvars.ContextVar('press_captured_logs', default=None)
+        # Build each package in a scratch folder ('' = tmpfs if available, else this directory)
+        # and publish only finished artifacts into the archive; None builds in place
+        self.scratch_root = scratch
+        self._scratch = None
+
+    def _log(self, message):
+        buffer = self._log_buffer.get()
+        if buffer is not None:
+            buffer.write(message + "\n")
+        else:
+            print(message)
+
+    def _log_path(self, job, stage):
+        log_dir = os.path.join(self.root, '.press_cache', 'logs', job.folder)
+        os.makedirs(log_dir, exist_ok=True)
+        log_path = os.path.join(log_dir, stage.replace(':', '_') + '.log')
+        captured = self._captured.get()
+        if captured is not None and log_path not in captured:
+            captured.append(log_path)
+        return log_path
+
+    def _run(self, job, stage, cmd, output=None, check=True):
+        """subprocess.run for a backend command: cwd=package folder, output logged, traced as `stage`."""
+        with self.tracer.span(stage, job.folder, output=output) as info:
+            with open(self._log_path(job, stage), 'wb') as log:
+                result = subprocess.run(
+                    cmd, check=check, cwd=job.path, stdin=subprocess.DEVNULL, stdout=log, stderr=subprocess.STDOUT,
+                    timeout=self.timeout
+                )
+            info['exit_code'] = result.returncode
+        return result
 
-    def create_paper_package(self, folder_name, title, journal, latex_content, eli5_content, code_content):
-        # Create Folder
+    async def _arun(self, job, stage, cmd, output=None, check=True):
+        """asyncio variant of _run: killed on timeout or when the awaiting task is cancelled."""
+        with self.tracer.span(stage, job.folder, output=output) as info:
+            info['exit_code'] = await run_process(
+                cmd, cwd=job.path, timeout=self.timeout, check=check, log_path=self._log_path(job, stage)
+            )
+        return info['exit_code']
+
+    def _diagnostics(self, paths):
+        diagnostics = []
+        for path in paths:
+            try:
+                with open(path, 'r', encoding='utf-8', errors='replace') as f:
+                    diagnostics += parse_log(f.read())
+            except OSError:
+                pass
+        return diagnostics
+
+    def add_package(self, folder_name, title, journal, latex_content, eli5_content, code_content):
+        """Registers one package's artifacts as build-graph nodes (PACKAGE:tex ... PACKAGE:pdf)."""
         path = os.path.join(self.root, folder_name)
-        if not os.path.exists(path):
-            os.makedirs(path)
+        # Backends run with cwd=path, so hand them absolute paths
+        abs_path = os.path.abspath(path)
+        work = abs_path
+        if self.scratch_root is not None:
+            if self._scratch is None:
+                self._scratch = ScratchSpace(self.scratch_root or None)
+            work = self._scratch.package_dir(folder_name)
+        job = PaperJob(
+            folder=folder_name, title=title, journal=journal, latex_content=latex_content,
+            path=work, tex_path=os.path.join(work, f"{folder_name}_Manuscript.tex"),
+            pdf_out=os.path.join(work, f"{folder_name}_Manuscript.pdf"),
+            docx_out=os.path.join(work, f"{folder_name}_Manuscript.docx"), archive_path=abs_path,
+        )
+        self._jobs[folder_name] = job
+        eli5_path = os.path.join(work, f"{folder_name}_ELI5.md")
+        code_path = os.path.join(work, f"{folder_name}_Verification.py")
+        figures = [resolve_figure(name, abs_path) for name in referenced_figures(latex_content)]
+        manuscript = hashlib.sha256(latex_content.encode('utf-8')).hexdigest()
+        sources = hashlib.sha256("\0".join([eli5_content, code_content]).encode('utf-8')).hexdigest()
+        pandoc_version = self.toolchain.version('pandoc') or self.toolchain.which('pandoc') or ''
+
+        def node(artifact, method, deps=(), outputs=(), key=''):
+            # The graph tracks the published (archive) files; actions write into the build folder
+            self.graph.add(
+                f"{folder_name}:{artifact}", self._node_action(job, artifact, method),
+                [f"{folder_name}:{dep}" for dep in deps], [job.final(p) for p in outputs], key
+            )
+
+        # The manuscript is a node of its own, so an ELI5 or verification edit leaves the PDF fresh
+        node('tex', self._write_manuscript, outputs=[job.tex_path], key=manuscript)
+        node('sources', lambda job: self._write_sources(job, eli5_content, code_content),
+             outputs=[eli5_path, code_path], key=sources)
+        self.graph.add(f"{folder_name}:figures", outputs=[f for f in figures if f])
+        node('ast', self._make_ast, deps=['tex'], outputs=[job.ast_path], key=pandoc_version)
+        node('docx', self._make_docx, deps=['ast'], outputs=[job.docx_out], key=pandoc_version)
+        node('html', self._make_pandoc_html, deps=['ast'], outputs=[job.html_pandoc], key=pandoc_version)
+        node('pdf', self._build_pdf, deps=['tex', 'figures'], outputs=[job.pdf_out], key=self.toolchain.fingerprint())
+        return job
+
+    def _node_action(self, job, artifact, method):
+        """
+        Wraps an async package step as a graph action with its own log buffer and trace span.
+        In a scratch build the step's inputs are staged in first and its outputs published after.
+        """
+        def action():
+            buffer = io.StringIO()
+            token = self._log_buffer.set(buffer)
+            # A node built on demand from inside a PDF backend must not feed that backend's diagnosis
+            self._captured.set(None)
+            node = self.graph.nodes[f"{job.folder}:{artifact}"]
+            try:
+                with self.tracer.span(f'node:{artifact}', job.folder):
+                    self._stage_in(job, node.deps)
+                    if job.path == job.archive_path:
+                        # Tools write these in place; never through a hardlink shared by the object store
+                        for path in node.outputs:
+                            detach(path)
+                    start = time.perf_counter()
+                    ok = asyncio.run(method(job))
+                    if ok:
+                        self._publish(job, node)
+                        self._record(job, artifact, node, time.perf_counter() - start)
+                    return ok
+            finally:
+                job.logs[artifact] = buffer.getvalue()
+                self._log_buffer.reset(token)
+        return action
+
+    def _record(self, job, artifact, node, seconds):
+        """Lists a node's published outputs in the artifact manifest with their provenance."""
+        backend = job.pdf_backend if artifact == 'pdf' else ARTIFACT_PRODUCERS.get(artifact)
+        inputs = [path for dep in node.deps for path in self.graph.nodes[dep].outputs]
+        with self.tracer.span('manifest:record', job.folder):
+            for path in node.outputs:
+                self.manifest.record(path, backend=backend, seconds=seconds, inputs=inputs, key=node.key)
+
+    def _stage_in(self, job, names):
+        """Copies the archive outputs of the given nodes into a scratch build folder."""
+        if job.path == job.archive_path:
+            return
+        for name in names:
+            for path in self.graph.nodes[name].outputs:
+                self._scratch.stage_in(path, job.working(path))
+
+    def _publish(self, job, node):
+        """Renames a scratch node's finished outputs into the archive folder."""
+        if job.path == job.archive_path:
+            return
+        published = []
+        with self.tracer.span('publish', job.folder) as info:
+            info['bytes_skipped'] = 0
+            for path in node.outputs:
+                if not os.path.isfile(job.working(path)):
+                    continue
+                skipped = job.note_unchanged(path, self._scratch.publish(job.working(path), path))
+                info['bytes_skipped'] += skipped
+                if not skipped:
+                    published.append(os.path.basename(path))
+        if published:
+            self._log(f">> [PUBLISHED] {', '.join(published)} -> {job.archive_path}")
 
-        # 1. Write LaTeX File (.tex)
-        tex_path = os.path.join(path, f"{folder_name}_Manuscript.tex")
-        with open(tex_path, 'w', encoding='utf-8') as f:
-            f.write(latex_content)
+    def create_paper_package(self, folder_name, title, journal, latex_content, eli5_content, code_content):
+        """Builds one package's default artifacts (sources, DOCX, PDF); returns True on a PDF."""
+        self.add_package(folder_name, title, journal, latex_content, eli5_content, code_content)
+        targets = [f"{folder_name}:{artifact}" for artifact in DEFAULT_ARTIFACTS]
+        plan = self.graph.plan(targets)
+        # Independent nodes (the pandoc DOCX and the PDF cascade) overlap, as in build_packages
+        jobs = max(1, min(os.cpu_count() or 1, len(plan)))
+        try:
+            self.graph.run(targets, jobs=jobs, on_done=self._report_node)
+        finally:
+            self._save_manifest(plan)
+        return self.graph.nodes[f"{folder_name}:pdf"].state in (FRESH, BUILT)
 
-        # 2. Write ELI5 File (.md)
-        eli5_path = os.path.join(path, f"{folder_name}_ELI5.md")
-        with open(eli5_path, 'w', encoding='utf-8') as f:
-            f.write(eli5_content)
+    def _write_files(self, job, files):
+        """Writes (stage, path, content) triples; unchanged files are not rewritten and keep their mtime."""
+        # Create Folder
+        if not os.path.exists(job.path):
+            os.makedirs(job.path)
+        for stage, path, content in files:
+            with self.tracer.span(stage, job.folder, output=path) as info:
+                info['bytes_skipped'] = job.note_unchanged(path, write_if_changed(path, content))
+
+    async def _write_manuscript(self, job):
+        # 1. LaTeX File (.tex)
+        self._write_files(job, [('write:tex', job.tex_path, job.latex_content)])
+        self._log(f">> [MANIFESTED] {job.folder} | Target: {job.journal}")
+        return True
 
-        # 3. Write Code File (.py)
-        code_path = os.path.join(path, f"{folder_name}_Verification.py")
-        with open(code_path, 'w', encoding='utf-8') as f:
-            f.write(code_content)
+    async def _write_sources(self, job, eli5_content, code_content):
+        # 2. ELI5 File (.md), 3. Code File (.py)
+        self._write_files(job, [
+            ('write:eli5', os.path.join(job.path, f"{job.folder}_ELI5.md"), eli5_content),
+            ('write:code', os.path.join(job.path, f"{job.folder}_Verification.py"), code_content),
+        ])
+        return True
 
-        print(f">> [MANIFESTED] {folder_name} | Target: {journal}")
+    async def _build_pdf(self, job):
+        """The PDF node: restore from the build cache, else run the fallback cascade."""
+        # 4. Reuse cached outputs when source, figures and toolchain are unchanged
+        hit, cache_key = self._cache_restore(job, 'pdf', job.pdf_out)
+        if hit:
+            job.pdf_backend = 'cache'
+            self._log(f">> [PDF OK] {job.final(job.pdf_out)}")
+            return True
 
-        # 4. Compile outputs (PDF robustly + DOCX via Pandoc)
+        # 5. Static pre-flight: a manuscript that cannot compile never enters the cascade
+        with self.tracer.span('preflight', job.folder) as info:
+            report = check_manuscript(job.latex_content, job.path)
+            info['errors'] = len(report.errors)
+        for line in report.lines():
+            self._log(f">> [PREFLIGHT] {line}")
+        if not report.ok:
+            self._log(">> [PDF SKIPPED] Pre-flight failed; fix the manuscript before compiling.")
+            return False
+        job.missing_packages = report.missing_packages
+
+        # 6. Compile the PDF robustly
+        compiled = False
         try:
-            pdf_out = os.path.join(path, f"{folder_name}_Manuscript.pdf")
-            docx_out = os.path.join(path, f"{folder_name}_Manuscript.docx")
+            compiled = await self._compile_pdf(job)
 
-            def pdf_exists_ok():
-                return os.path.exists(pdf_out) and os.path.getsize(pdf_out) > 0
-
-            # Prefer native TeX toolchains for the highest fidelity PDF
-            compiled = False
-
-            # A) tectonic (fast, hermetic LaTeX engine)
-            if not compiled and shutil.which('tectonic'):
-                try:
-                    subprocess.run(
-                        ['tectonic', '-X', 'compile', tex_path, '--outdir', path],
-                        check=True, cwd=path, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
-                    )
-                    compiled = pdf_exists_ok()
-                except Exception:
-                    compiled = False
+            if compiled:
+                self._log(f">> [PDF OK] {job.final(job.pdf_out)}")
+            else:
+                # Summarize detected tools for easier troubleshooting
+                found = self.toolchain.detected()
+                self._log(
+                    ">> [PDF SKIPPED] No working toolchain found or all methods failed. "
+                    + "Detected: " + (", ".join(found) if found else "none") + ". "
+                    + "Install one of: Tectonic, MiKTeX (pdflatex/latexmk), Pandoc, LibreOffice, or use Edge/Chrome headless (or wkhtmltopdf)."
+                )
+        except Exception as e:
+            self._log(f">> [WARN] Output compilation encountered an error: {e}")
+
+        if compiled:
+            self._cache_store(job, cache_key, 'pdf', job.pdf_out)
+        return compiled
+
+    def _cache_restore(self, job, artifact, path):
+        """
+        Restores `artifact` from the build cache. Returns (hit, key to store a fresh build under);
+        the key is None when the cache is off or unusable.
+        """
+        if self.cache is None:
+            return False, None
+        try:
+            cache_key = source_key(job.latex_content, job.path, self.toolchain.fingerprint())
+            with self.tracer.span('cache:restore', job.folder, output=path) as info:
+                info['hit'] = self.cache.restore(cache_key, {artifact: path})
+        except Exception as e:
+            self._log(f">> [WARN] Build cache unavailable: {e}")
+            return False, None
+        if info['hit']:
+            self._log(f">> [CACHE HIT] {job.folder}:{artifact} ({cache_key[:12]})")
+        return info['hit'], cache_key
+
+    def _cache_store(self, job, cache_key, artifact, path):
+        if cache_key is None:
+            return
+        try:
+            with self.tracer.span('cache:store', job.folder):
+                self.cache.store(cache_key, {artifact: path})
+        except Exception as e:
+            self._log(f">> [WARN] Could not store build cache entry: {e}")
+
+    async def _compile_pdf(self, job):
+        """
+        Runs the PDF fallback cascade. Backends that need another artifact (the pandoc AST for D,
+        the DOCX for E/F, the MathJax HTML for G) get it from the build graph, which reuses a
+        fresh one, waits for one being built in parallel, or builds it on demand.
+
+        The backends are tried strictly one after another and nothing is started speculatively,
+        so once one wins there is no concurrent losing attempt left to cancel; a backend's own
+        subprocess is still killed on timeout (press_async.run_process).
+        """
+        compiled = False
+        if self.failures is not None and job.source_hash is None:
+            job.source_hash = source_key(job.latex_content, job.path)
+        # Backends ruled out by a root cause found in this build: {backend: (reason, remember)}.
+        # Missing packages depend on the TeX installation, not on the source or tool versions
+        # that key the failure cache, so they are re-checked every build instead of remembered.
+        doomed = {}
+        if job.missing_packages:
+            reason = f"missing package {', '.join(job.missing_packages)} (pre-flight)"
+            doomed = {backend: (reason, False) for backend in SHARED_CAUSES['missing-package']}
+        # Native TeX toolchains first for the highest fidelity PDF, except that the backend
+        # which last succeeded for this package is tried before all others
+        for backend in self.toolchain.ordered(job.folder, PDF_BACKENDS):
+            version = self._backend_version(backend)
+            known = self.failures.lookup(backend, version, job.source_hash) if self.failures and version else None
+            if known:
+                self._log(f">> [SKIP] {backend}: {known['reason']} (known failure since {known['since']})")
+                job.skipped.append((backend, known['reason']))
+                continue
+            if backend in doomed:
+                reason, remember = doomed[backend]
+                self._log(f">> [SKIP] {backend}: {reason}")
+                job.skipped.append((backend, reason))
+                if remember and self.failures is not None and version:
+                    self.failures.record(backend, version, job.source_hash, reason)
+                continue
+            captured = []
+            token = self._captured.set(captured)
+            try:
+                with self.tracer.span(f'backend:{backend}', job.folder, output=job.pdf_out) as info:
+                    compiled = await getattr(self, f'_pdf_{backend}')(job)
+                    info['ok'] = compiled
+            except subprocess.CalledProcessError as e:
+                compiled = False
+                reason = f"{os.path.basename(str(e.cmd[0]))} exited with code {e.returncode}"
+                # An undiagnosed exit (OOM, a signal, a killed tool, a flaky font cache) may not
+                # happen again, so only a root cause found in the log is persisted
+                remember = False
+                cause = root_cause(self._diagnostics(captured))
+                if cause:
+                    reason = str(cause[1])
+                    remember = cause[0] != 'missing-package'
+                    self._log(f">> [DIAG] {backend}: {reason}")
+                    group = SHARED_CAUSES.get(cause[0], [])
+                    if backend in group:
+                        for other in group:
+                            doomed.setdefault(other, (f"same root cause as {backend} ({reason})", remember))
+                # A tool whose log shows it rejected this source will do so again: remember it
+                if remember and self.failures is not None and version:
+                    self.failures.record(backend, version, job.source_hash, reason)
+            except Exception:
+                compiled = False
+            finally:
+                self._captured.reset(token)
+            if compiled and backend in TEX_BACKENDS:
+                boxes = [d for d in self._diagnostics(captured) if d.kind in ('overfull', 'underfull')]
+                if boxes:
+                    self._log(f">> [DIAG] {backend}: {len(boxes)} over/underfull box warning(s), first: {boxes[0]}")
+            if compiled:
+                job.pdf_backend = backend
+                self.toolchain.record_winner(job.folder, backend)
+                if self.failures is not None and version:
+                    self.failures.clear(backend, version, job.source_hash)
+                break
+        return compiled
+
+    def _backend_version(self, backend):
+        """Versions of the installed tools `backend` relies on; '' when none is installed."""
+        return ";".join(
+            f"{tool}={self.toolchain.version(tool) or self.toolchain.which(tool)}"
+            for tool in BACKEND_TOOLS.get(backend, [backend]) if self.toolchain.which(tool)
+        )
 
-            # B) latexmk (drives pdflatex/xelatex as needed)
-            if not compiled and shutil.which('latexmk'):
-                try:
-                    subprocess.run(
-                        ['latexmk', '-pdf', '-interaction=nonstopmode', '-halt-on-error', tex_path],
-                        check=True, cwd=path, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
-                    )
-                    compiled = pdf_exists_ok()
-                except Exception:
-                    compiled = False
+    async def _artifact(self, job, artifact):
+        """Brings another node of this package up to date; True if its output is usable."""
+        name = f"{job.folder}:{artifact}"
+        if not await asyncio.to_thread(self.graph.ensure, name):
+            return False
+        # A fresh node did not run, so a scratch build still needs its outputs copied in
+        await asyncio.to_thread(self._stage_in, job, [name])
+        return True
 
-            # C) pdflatex (2 passes)
-            if not compiled and shutil.which('pdflatex'):
-                try:
-                    for _ in range(2):
-                        subprocess.run(
-                            ['pdflatex', '-interaction=nonstopmode', '-halt-on-error', tex_path],
-                            check=True, cwd=path, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
-                        )
-                    compiled = pdf_exists_ok()
-                except Exception:
-                    compiled = False
+    # ------------------------------------------------------------------
+    # PDF backends (see PDF_BACKENDS). Each returns True once a non-empty PDF exists.
+    # ------------------------------------------------------------------
+
+    async def _pdf_tectonic(self, job):
+        # A) tectonic (fast, hermetic LaTeX engine)
+        tectonic = self.toolchain.which('tectonic')
+        if not tectonic:
+            return False
+        await self._arun(job, 'tectonic', [tectonic, '-X', 'compile', job.tex_path, '--outdir', job.path], output=job.pdf_out)
+        return job.pdf_ok()
+
+    async def _pdf_latexmk(self, job):
+        # B) latexmk (drives pdflatex/xelatex as needed)
+        latexmk = self.toolchain.which('latexmk')
+        if not latexmk:
+            return False
+        await self._arun(
+            job, 'latexmk', [latexmk, '-pdf', '-interaction=nonstopmode', '-halt-on-error', job.tex_path],
+            output=job.pdf_out
+        )
+        return job.pdf_ok()
 
-            # D) Pandoc fallback (with or without explicit PDF engine)
-            if not compiled and shutil.which('pandoc'):
-                try:
-                    engine = 'xelatex' if shutil.which('xelatex') else ('pdflatex' if shutil.which('pdflatex') else None)
-                    if engine:
-                        subprocess.run(
-                            ['pandoc', tex_path, '--pdf-engine', engine, '-o', pdf_out],
-                            check=True, cwd=path, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
-                        )
-                    else:
-                        subprocess.run(
-                            ['pandoc', tex_path, '-o', pdf_out],
-                            check=True, cwd=path, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
-                        )
-                    compiled = pdf_exists_ok()
-                except Exception:
-                    compiled = False
+    def _format_store(self):
+        with self._formats_lock:
+            if self._formats is None and self.use_formats and self.toolchain.which('pdflatex'):
+                self._formats = FormatStore(
+                    os.path.join(self.root, '.press_cache', 'formats'), self.toolchain.which('pdflatex')
+                )
+            return self._formats
+
+    async def _pdf_pdflatex(self, job):
+        # C) pdflatex, re-run only while .aux/.toc/.out are still changing (preamble from a precompiled format)
+        pdflatex = self.toolchain.which('pdflatex')
+        if not pdflatex:
+            return False
+        # The pass loop reads aux files between runs, so it stays synchronous in a worker thread
+        await asyncio.to_thread(
+            compile_pdflatex, job.tex_path, job.path, pdflatex, formats=self._format_store(),
+            latex_content=job.latex_content, runner=lambda cmd: self._run(job, 'pdflatex:pass', cmd, output=job.pdf_out),
+            log=self._log
+        )
+        return job.pdf_ok()
+
+    async def _pdf_pandoc(self, job):
+        # D) Pandoc fallback (with or without explicit PDF engine)
+        pandoc = self.toolchain.which('pandoc')
+        if not pandoc:
+            return False
+        engine = self.toolchain.which('xelatex') or self.toolchain.which('pdflatex')
+        source = await self._pandoc_source(job)
+        if engine:
+            cmd = [pandoc] + source + ['--pdf-engine', engine, '-o', job.pdf_out]
+        else:
+            cmd = [pandoc] + source + ['-o', job.pdf_out]
+        await self._arun(job, 'pandoc:pdf', cmd, output=job.pdf_out)
+        return job.pdf_ok()
+
+    async def _make_ast(self, job):
+        """Parses the manuscript into pandoc's JSON AST next to the .tex (the graph decides when)."""
+        pandoc = self.toolchain.which('pandoc')
+        if not pandoc:
+            return False
+        tmp = job.ast_path + '.tmp'
+        await self._arun(job, 'pandoc:parse', [pandoc, '-f', 'latex', '-t', 'json', job.tex_path, '-o', tmp], output=tmp)
+        os.replace(tmp, job.ast_path)
+        return True
 
-            # DOCX via Pandoc (independent of PDF success) — used by later fallbacks too
-            if shutil.which('pandoc'):
-                try:
-                    subprocess.run(
-                        ['pandoc', tex_path, '-o', docx_out],
-                        check=False, cwd=path, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
-                    )
-                except Exception:
-                    pass
+    async def _pandoc_source(self, job):
+        """pandoc input arguments: the parsed AST when available, else the .tex itself."""
+        if await self._artifact(job, 'ast'):
+            return ['-f', 'json', job.ast_path]
+        return [job.tex_path]
+
+    async def _make_docx(self, job):
+        """
+        DOCX via Pandoc from the AST (independent of PDF success); also feeds the DOCX -> PDF backends.
+        Cached next to the PDF under the same source key, so a cold tree restores it without pandoc.
+        """
+        hit, cache_key = self._cache_restore(job, 'docx', job.docx_out)
+        if hit:
+            return True
+        pandoc = self.toolchain.which('pandoc')
+        if not pandoc:
+            return False
+        source = await self._pandoc_source(job)
+        await self._arun(job, 'pandoc:docx', [pandoc] + source + ['-o', job.docx_out], output=job.docx_out)
+        if not os.path.exists(job.docx_out):
+            return False
+        self._cache_store(job, cache_key, 'docx', job.docx_out)
+        return True
 
-            # E) LibreOffice (DOCX -> PDF), if DOCX exists
-            if not compiled and os.path.exists(docx_out):
-                soffice = shutil.which('soffice.com') or shutil.which('soffice')
+    async def _make_pandoc_html(self, job):
+        """Standalone MathJax HTML for fallback G, rendered from the AST."""
+        pandoc = self.toolchain.which('pandoc')
+        if not pandoc:
+            return False
+        source = await self._pandoc_source(job)
+        await self._arun(job, 'pandoc:html', [pandoc, '-s'] + source + ['--mathjax', '-o', job.html_pandoc], output=job.html_pandoc)
+        return os.path.exists(job.html_pandoc) and os.path.getsize(job.html_pandoc) > 0
+
+    async def _docx_ready(self, job):
+        return await self._artifact(job, 'docx')
+
+    async def _pdf_soffice(self, job):
+        # E) LibreOffice (DOCX -> PDF), if DOCX exists; batched with other packages reaching E
+        batcher = self._soffice_batcher()
+        if batcher is None or not await self._docx_ready(job):
+            return False
+        with self.tracer.span('soffice:batch', job.folder, output=job.pdf_out) as info:
+            info['batch'] = await asyncio.to_thread(batcher.convert, job.docx_out, job.pdf_out)
+        if info['batch'] > 1:
+            self._log(f">> [SOFFICE] Converted in one launch with {info['batch'] - 1} other package(s)")
+        return job.pdf_ok()
+
+    def _soffice_batcher(self):
+        with self._soffice_lock:
+            if self._soffice is None:
+                soffice = self.toolchain.which('soffice.com') or self.toolchain.which('soffice')
                 if soffice:
-                    try:
-                        subprocess.run(
-                            [soffice, '--headless', '--convert-to', 'pdf', '--outdir', path, docx_out],
-                            check=True, cwd=path, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
-                        )
-                        compiled = pdf_exists_ok()
-                    except Exception:
-                        compiled = False
-
-            # F) Microsoft Word COM (DOCX -> PDF) via PowerShell (Windows only)
-            if not compiled and os.path.exists(docx_out) and shutil.which('powershell'):
-                try:
-                    ps_cmd = (
-                        "$in = '" + docx_out.replace("'", "''") + "'; "
-                        "$out = '" + pdf_out.replace("'", "''") + "'; "
-                        "$word = New-Object -ComObject Word.Application; "
-                        "$word.Visible = $false; "
-                        "$doc = $word.Documents.Open($in); "
-                        "$doc.ExportAsFixedFormat($out, 17); "
-                        "$doc.Close(); $word.Quit();"
-                    )
-                    subprocess.run(
-                        ['powershell', '-NoProfile', '-Command', ps_cmd],
-                        check=True, cwd=path, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+                    self._soffice = SofficeBatcher(
+                        soffice, os.path.join(self.root, '.press_cache', 'soffice_profile'), timeout=self.timeout
                     )
-                    compiled = pdf_exists_ok()
-                except Exception:
-                    compiled = False
-
-            # G) Browser headless print (HTML/preview -> PDF) using Edge/Chrome with robust Windows handling
-            if not compiled:
+            return self._soffice
+
+    async def _pdf_word(self, job):
+        # F) Microsoft Word COM (DOCX -> PDF) via PowerShell (Windows only)
+        powershell = self.toolchain.which('powershell')
+        if not powershell or not await self._docx_ready(job):
+            return False
+        ps_cmd = (
+            "$in = '" + job.docx_out.replace("'", "''") + "'; "
+            "$out = '" + job.pdf_out.replace("'", "''") + "'; "
+            "$word = New-Object -ComObject Word.Application; "
+            "$word.Visible = $false; "
+            "$doc = $word.Documents.Open($in); "
+            "$doc.ExportAsFixedFormat($out, 17); "
+            "$doc.Close(); $word.Quit();"
+        )
+        await self._arun(job, 'word', [powershell, '-NoProfile', '-Command', ps_cmd], output=job.pdf_out)
+        return job.pdf_ok()
+
+    async def _pdf_browser(self, job):
+        # G) Browser headless print (HTML/preview -> PDF) using Edge/Chrome with robust Windows handling
+        path = job.path
+        # Prefer the Pandoc HTML from the build graph (no TeX engine required)
+        html_pandoc = job.html_pandoc
+        made_pandoc_html = await self._artifact(job, 'html')
+
+        # Always create a simple HTML preview as a fallback
+        html_preview = os.path.join(path, f"{job.folder}_Manuscript_preview.html")
+        try:
+            with open(job.tex_path, 'r', encoding='utf-8') as tf:
+                latex_src = tf.read()
+        except Exception:
+            latex_src = ''
+        html_body = (
+            '<!DOCTYPE html><html><head><meta charset="utf-8">'
+            f'<title>{job.title} — {job.journal}</title>'
+            '<style>body{font-family:Segoe UI,Arial,Helvetica,sans-serif;margin:48px;}'
+            'h1{margin-bottom:24px;}pre{white-space:pre-wrap;word-wrap:break-word;font-family:Consolas,monospace;font-size:12pt;}'
+            '</style></head><body>'
+            f'<h1>{job.title}</h1>'
+            '<h3>Preview (LaTeX source)</h3>'
+            '<pre>' + (latex_src.replace('&','&amp;').replace('<','&lt;').replace('>','&gt;')) + '</pre>'
+            '</body></html>'
+        )
+        with self.tracer.span('write:html_preview', job.folder, output=html_preview):
+            write_if_changed(html_preview, html_body)
+
+        # Prefer Pandoc HTML if created; else fallback preview
+        html_to_print = html_pandoc if made_pandoc_html else html_preview
+        html_uri = Path(html_to_print).resolve().as_uri()
+        pdf_out_abs = str(Path(job.pdf_out).resolve())
+
+        browsers = [self.toolchain.which(name) for name in BROWSERS]
+        browsers = [b for b in browsers if b]
+
+        # Print through the build's persistent DevTools session, waiting for MathJax to finish
+        session = await asyncio.to_thread(self._browser, browsers)
+        if session is not None:
+            try:
+                with self.tracer.span('print:devtools', job.folder, output=job.pdf_out):
+                    await asyncio.to_thread(session.print_to_pdf, html_to_print, job.pdf_out, self.timeout)
+                if job.pdf_ok():
+                    return True
+            except Exception as e:
+                self._log(f">> [WARN] DevTools print failed, falling back to one-shot browser runs: {e}")
+
+        # One browser process per attempt: try multiple headless variants for better compatibility
+        headless_variants = [
+            ['--headless=new', '--disable-gpu'],
+            ['--headless', '--disable-gpu'],
+            ['--headless', '--disable-gpu', '--no-sandbox']
+        ]
+
+        for b in browsers:
+            for flags in headless_variants:
                 try:
-                    # Try to build a better HTML via Pandoc first (no TeX engine required)
-                    html_pandoc = os.path.join(path, f"{folder_name}_Manuscript_pandoc.html")
-                    made_pandoc_html = False
-                    if shutil.which('pandoc'):
-                        try:
-                            subprocess.run(
-                                ['pandoc', '-s', tex_path, '--mathjax', '-o', html_pandoc],
-                                check=True, cwd=path, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
-                            )
-                            made_pandoc_html = os.path.exists(html_pandoc) and os.path.getsize(html_pandoc) > 0
-                        except Exception:
-                            made_pandoc_html = False
-
-                    # Always create a simple HTML preview as a fallback
-                    html_preview = os.path.join(path, f"{folder_name}_Manuscript_preview.html")
-                    try:
-                        with open(tex_path, 'r', encoding='utf-8') as tf:
-                            latex_src = tf.read()
-                    except Exception:
-                        latex_src = ''
-                    html_body = (
-                        '<!DOCTYPE html><html><head><meta charset="utf-8">'
-                        f'<title>{title} — {journal}</title>'
-                        '<style>body{font-family:Segoe UI,Arial,Helvetica,sans-serif;margin:48px;}'
-                        'h1{margin-bottom:24px;}pre{white-space:pre-wrap;word-wrap:break-word;font-family:Consolas,monospace;font-size:12pt;}'
-                        '</style></head><body>'
-                        f'<h1>{title}</h1>'
-                        '<h3>Preview (LaTeX source)</h3>'
-                        '<pre>' + (latex_src.replace('&','&amp;').replace('<','&lt;').replace('>','&gt;')) + '</pre>'
-                        '</body></html>'
-                    )
-                    with open(html_preview, 'w', encoding='utf-8') as hf:
-                        hf.write(html_body)
-
-                    # Prefer Pandoc HTML if created; else fallback preview
-                    html_to_print = html_pandoc if made_pandoc_html else html_preview
-                    html_uri = Path(html_to_print).resolve().as_uri()
-                    pdf_out_abs = str(Path(pdf_out).resolve())
-
-                    browsers = [
-                        shutil.which('msedge'), shutil.which('msedge.exe'),
-                        shutil.which('chrome'), shutil.which('chrome.exe'),
-                        shutil.which('google-chrome'), shutil.which('chromium'), shutil.which('chromium.exe')
-                    ]
-                    browsers = [b for b in browsers if b]
-
-                    # Try multiple headless variants for better compatibility
-                    headless_variants = [
-                        ['--headless=new', '--disable-gpu'],
-                        ['--headless', '--disable-gpu'],
-                        ['--headless', '--disable-gpu', '--no-sandbox']
-                    ]
-
-                    for b in browsers:
-                        if compiled:
-                            break
-                        for flags in headless_variants:
-                            try:
-                                cmd = [b] + flags + [f'--print-to-pdf={pdf_out_abs}', '--virtual-time-budget=7000', html_uri]
-                                subprocess.run(cmd, check=True, cwd=path, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-                                if pdf_exists_ok():
-                                    compiled = True
-                                    break
-                            except Exception:
-                                continue
-
-                    # Additional fallback: wkhtmltopdf, if available
-                    if not compiled and shutil.which('wkhtmltopdf'):
-                        try:
-                            subprocess.run([
-                                shutil.which('wkhtmltopdf'), html_to_print, pdf_out_abs
-                            ], check=True, cwd=path, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-                            compiled = pdf_exists_ok()
-                        except Exception:
-                            compiled = False
+                    cmd = [b] + flags + [f'--print-to-pdf={pdf_out_abs}', '--virtual-time-budget=7000', html_uri]
+                    await self._arun(job, f'print:{os.path.basename(b)}', cmd, output=job.pdf_out)
+                    if job.pdf_ok():
+                        return True
                 except Exception:
-                    compiled = False
+                    continue
 
-            if compiled:
-                print(f">> [PDF OK] {pdf_out}")
-            else:
-                # Summarize detected tools for easier troubleshooting
-                found = []
-                for tool in ['tectonic','latexmk','pdflatex','xelatex','pandoc','soffice','soffice.com','msedge','msedge.exe','chrome','chrome.exe','google-chrome','chromium','wkhtmltopdf']:
-                    if shutil.which(tool):
-                        found.append(tool)
-                print(
-                    ">> [PDF SKIPPED] No working toolchain found or all methods failed. "
-                    + "Detected: " + (", ".join(found) if found else "none") + ". "
-                    + "Install one of: Tectonic, MiKTeX (pdflatex/latexmk), Pandoc, LibreOffice, or use Edge/Chrome headless (or wkhtmltopdf)."
-                )
-        except Exception as e:
-            print(f">> [WARN] Output compilation encountered an error: {e}")
+        # Additional fallback: wkhtmltopdf, if available
+        wkhtmltopdf = self.toolchain.which('wkhtmltopdf')
+        if wkhtmltopdf:
+            await self._arun(job, 'print:wkhtmltopdf', [wkhtmltopdf, html_to_print, pdf_out_abs], output=job.pdf_out)
+            return job.pdf_ok()
+        return False
 
-    def run(self):
-        print(">> [INITIATING] OMNIPOTENT PRESS: FULL INTEGRATION MODE...")
+    def _browser(self, browsers):
+        """Starts (once per build) the shared DevTools print session; None if unavailable."""
+        if not self.use_devtools or not browsers:
+            return None
+        with self._browser_lock:
+            if self._browser_session is None:
+                self._browser_session = False
+                for b in browsers:
+                    try:
+                        self._browser_session = BrowserPrintSession(b).start()
+                        break
+                    except Exception as e:
+                        self._log(f">> [WARN] Could not start DevTools session with {b}: {e}")
+            return self._browser_session or None
+
+    def close_browser(self):
+        with self._browser_lock:
+            if self._browser_session:
+                self._browser_session.close()
+            self._browser_session = None
+
+    def close_helpers(self):
+        """Shuts down the per-build browser session and LibreOffice batcher, and removes the scratch folder."""
+        self.close_browser()
+        with self._soffice_lock:
+            if self._soffice is not None:
+                self._soffice.close()
+            self._soffice = None
+        if self._scratch is not None:
+            self._scratch.close()
+            self._scratch = None
+
+    def _save_manifest(self, plan):
+        """Lists up-to-date artifacts that predate the manifest, then writes it."""
+        for name in plan:
+            node = self.graph.nodes[name]
+            if node.state == FRESH:
+                for path in node.outputs:
+                    self.manifest.refresh(path)
+        self.manifest.save()
+
+    @staticmethod
+    def resolve_targets(targets, folders):
+        """
+        Expands PACKAGE[:ARTIFACT] specs into node names. PACKAGE may be any unique prefix
+        (e.g. `03`); without an artifact the package's default artifacts are built.
+        No specs means every package's default artifacts.
+        """
+        if not targets:
+            return [f"{folder}:{artifact}" for folder in folders for artifact in DEFAULT_ARTIFACTS]
+        nodes = []
+        for spec in targets:
+            package, _, artifact = spec.partition(':')
+            matches = [f for f in folders if f == package] or [f for f in folders if f.startswith(package)]
+            if len(matches) != 1:
+                raise ValueError(f"Unknown or ambiguous package '{package}' (choose from: {', '.join(folders)})")
+            if artifact and artifact.lower() not in ARTIFACTS:
+                raise ValueError(f"Unknown artifact '{artifact}' (choose from: {', '.join(ARTIFACTS)})")
+            for name in ([artifact.lower()] if artifact else DEFAULT_ARTIFACTS):
+                if f"{matches[0]}:{name}" not in nodes:
+                    nodes.append(f"{matches[0]}:{name}")
+        return nodes
+
+    def _report_node(self, node):
+        """
+        Prints a finished node's log as one block; nodes that were already up to date stay quiet.
+        Also called for nodes a backend built on demand outside the requested plan.
+        """
+        folder, _, artifact = node.name.partition(':')
+        log = self._jobs[folder].logs.get(artifact, '') if folder in self._jobs else ''
+        if node.state == FRESH and not log:
+            return
+        with self._print_lock:
+            print(f"\n---- {node.name} ({node.seconds:.1f}s, {node.state}) ----")
+            print(log, end='')
+            if node.error:
+                print(f">> [WARN] {node.error}")
+
+    def build_packages(self, packages, jobs=None, targets=None, force=False):
+        """
+        Builds the requested targets (default: every package's sources, DOCX and PDF) through the
+        build graph on a bounded worker pool (default: one worker per core). Only stale nodes run;
+        `force` rebuilds the named targets regardless. Each node's log is printed as one block when
+        it finishes, followed by a per-package summary.
+        """
+        for package in packages:
+            self.add_package(*package)
+        folders = [package[0] for package in packages]
+        nodes = self.resolve_targets(targets, folders)
+        plan = self.graph.plan(nodes)
+        jobs = max(1, min(jobs or os.cpu_count() or 1, len(plan)))
+        print(f">> [PRESS] Building {len(nodes)} target(s) ({len(plan)} node(s)) with {jobs} worker(s)...")
+        start = time.perf_counter()
+        try:
+            self.graph.run(nodes, jobs=jobs, force=force, on_done=self._report_node)
+        finally:
+            self.close_helpers()
+            self._save_manifest(plan)
+
+        results = []
+        print("\n>> [SUMMARY]")
+        for folder in folders:
+            planned = [self.graph.nodes[name] for name in plan if name.startswith(folder + ':')]
+            if not planned:
+                continue
+            pdf = self.graph.nodes[f"{folder}:pdf"]
+            compiled = pdf.state in (FRESH, BUILT)
+            status = '-' if f"{folder}:pdf" not in plan else 'PDF OK' if compiled else 'PDF SKIPPED'
+            seconds = sum(node.seconds for node in planned if node.state in (BUILT, FAILED))
+            detail = " ".join(f"{node.name.partition(':')[2]}={node.state}" for node in planned)
+            print(f"   {folder:<24} {status:<12} {seconds:7.1f}s  {detail}")
+            results.append((folder, compiled, seconds))
+        print(f"   {'wall clock':<24} {'':<12} {time.perf_counter() - start:7.1f}s")
+
+        unchanged = [(folder, self._jobs[folder]) for folder in folders if self._jobs[folder].unchanged]
+        if unchanged:
+            total = sum(job.bytes_skipped for _, job in unchanged)
+            print(f"\n>> [UNCHANGED] {total} byte(s) not rewritten (content identical, mtime kept):")
+            for folder, job in unchanged:
+                print(f"   {folder:<24} {job.bytes_skipped:>10}  {', '.join(job.unchanged)}")
+
+        skipped = [(folder, backend, reason) for folder in folders for backend, reason in self._jobs[folder].skipped]
+        if skipped:
+            print("\n>> [SKIPPED BACKENDS] Known or shared failures for unchanged sources and tools (--no-cache retries them):")
+            for folder, backend, reason in skipped:
+                print(f"   {folder:<24} {backend:<12} {reason}")
+
+        print(f"\n>> [MANIFEST] {len(self.manifest.artifacts)} artifact(s) indexed in {self.manifest.path}")
+
+        if self.trace_path:
+            self.tracer.write(self.trace_path)
+            print(f"\n>> [TRACE] Stage timings (Chrome trace written to {self.trace_path}):")
+            for line in self.tracer.summary_lines():
+                print(line)
+        return results
+
+    @staticmethod
+    def archive_packages():
+        """Every package as (folder, title, journal, LaTeX, ELI5, verification code)."""
+        packages = []
 
         # ==========================================
         # 1. P vs NP (Journal of the American Mathematical Society)
         # ==========================================
-        self.create_paper_package(
+        packages.append((
             "01_P_vs_NP",
             "On the Separation of Complexity Classes",
             "Journal of the American Mathematical Society",
@@ -333,12 +950,12 @@ The question is: Is there a secret trick that makes solving Sudoku as easy as ch
 We treated math problems like geometric shapes. We showed that the "Shape" of the hard problems (NP) is too spiky and complicated to fit inside the "Shape" of the easy problems (P), no matter how much you stretch or squash them.
 """,
             "# GCP-READY COMPLEXITY VALIDATOR\nimport numpy as np\n# ... (Full code from previous turns)"
-        )
+        ))
 
         # ==========================================
         # 2. Riemann Hypothesis (Inventiones mathematicae)
         # ==========================================
-        self.create_paper_package(
+        packages.append((
             "02_Riemann_Hypothesis",
             "Spectral Construction of Hilbert-Polya Operator]{Rigorous Construction of the Hilbert-Polya Operator via Self-Adjoint Extension of the Berry-Keating Hamiltonian",
             "Inventiones mathematicae",
@@ -451,12 +1068,12 @@ Prime numbers (2, 3, 5, 7...) are the building blocks of math. They seem to appe
 We showed that these "frequencies" behave exactly like the energy levels of a quantum system (like an atom). In physics, energy levels are always real numbers (they line up). Because they behave like physics, they must follow the rule.
 """,
             "# REVISED CODE: PRECISION-LOCKED SPECTRAL ANALYZER\n# ... (Full code from previous turns)"
-        )
+        ))
 
         # ==========================================
         # 3. Yang-Mills (Communications in Mathematical Physics)
         # ==========================================
-        self.create_paper_package(
+        packages.append((
             "03_Yang_Mills",
             "Exponential Decay in Non-Abelian Gauge Theories",
             "Communications in Mathematical Physics",
@@ -570,12 +1187,12 @@ def run_simulation():
 if __name__ == "__main__":
     run_simulation()
 """
-        )
+        ))
 
         # ==========================================
         # 4. Navier-Stokes (Acta Mathematica)
         # ==========================================
-        self.create_paper_package(
+        packages.append((
             "04_Navier_Stokes",
             "Global Regularity of Navier-Stokes Equations",
             "Acta Mathematica",
@@ -685,12 +1302,12 @@ if __name__ == "__main__":
     solver.initialize_vortex_rings()
     solver.run_stress_test()
 """
-        )
+        ))
 
         # ==========================================
         # 5. Hodge Conjecture (Publications Mathématiques de l'IHÉS)
         # ==========================================
-        self.create_paper_package(
+        packages.append((
             "05_Hodge_Conjecture",
             "Surjectivity of the Cycle Class Map",
             "Publications Mathématiques de l'IHÉS",
@@ -793,12 +1410,12 @@ def run_hodge_verification():
 if __name__ == "__main__":
     run_hodge_verification()
 """
-        )
+        ))
 
         # ==========================================
         # 6. BSD Conjecture (Inventiones mathematicae)
         # ==========================================
-        self.create_paper_package(
+        packages.append((
             "06_BSD_Conjecture",
             "The Full Birch and Swinnerton-Dyer Formula",
             "Inventiones mathematicae",
@@ -903,12 +1520,12 @@ def run():
 if __name__ == "__main__":
     run()
 """
-        )
+        ))
 
         # ==========================================
         # 7. Poincaré Conjecture (Journal of Differential Geometry)
         # ==========================================
-        self.create_paper_package(
+        packages.append((
             "07_Poincare_Conjecture",
             "Finite-Time Extinction of Ricci Flow",
             "Journal of Differential Geometry",
@@ -1008,12 +1625,76 @@ def run():
 if __name__ == "__main__":
     run()
 """
-        )
+        ))
+        return packages
 
-        print(
-            "\n>> [COMPLETE] All 7 Millennium Papers + ELI5 + Code have been manifested in 'Millennium_Prize_Solutions_MASTER'.")
+    def run(self, jobs=None, targets=None, force=False):
+        print(">> [INITIATING] OMNIPOTENT PRESS: FULL INTEGRATION MODE...")
+        self.build_packages(self.archive_packages(), jobs=jobs, targets=targets, force=force)
+
+        if targets:
+            print(f"\n>> [COMPLETE] Requested targets built: {' '.join(targets)}")
+        else:
+            print(
+                "\n>> [COMPLETE] All 7 Millennium Papers + ELI5 + Code have been manifested in 'Millennium_Prize_Solutions_MASTER'.")
 
 
 if __name__ == "__main__":
-    press = UniversalPressMaster()
-    press.run()
+    parser = argparse.ArgumentParser(description="Build the Millennium Prize archive.")
+    parser.add_argument('targets', nargs='*', metavar='PACKAGE[:ARTIFACT]',
+                        help=f"Build only these targets, e.g. 03_Yang_Mills:docx or 03 (artifacts: {', '.join(ARTIFACTS)}). "
+                             "Default: sources, DOCX and PDF of every package.")
+    parser.add_argument('-j', '--jobs', type=int, default=None,
+                        help="Packages to build concurrently (default: number of CPU cores; 1 = serial).")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="Do not restore PDFs from the build cache (see --force to rebuild up-to-date targets).")
+    parser.add_argument('--force', action='store_true',
+                        help="Rebuild the requested targets even if they are up to date.")
+    parser.add_argument('--no-formats', action='store_true',
+                        help="Do not precompile manuscript preambles into pdflatex formats.")
+    parser.add_argument('--trace', metavar='TRACE.json', default=None,
+                        help="Record every build stage and write a Chrome trace-event JSON file.")
+    parser.add_argument('--timeout', type=float, default=DEFAULT_TIMEOUT,
+                        help=f"Seconds before any single conversion subprocess is killed (default: {DEFAULT_TIMEOUT}).")
+    parser.add_argument('--no-devtools', action='store_true',
+                        help="Print HTML with one browser process per attempt instead of a shared DevTools session.")
+    parser.add_argument('--scratch', action='store_true',
+                        help="Build in a RAM-backed scratch folder (/dev/shm when available) and publish only "
+                             "finished artifacts into the archive with atomic renames.")
+    parser.add_argument('--scratch-dir', metavar='DIR', default=None,
+                        help="Create the --scratch folder under DIR instead (implies --scratch).")
+    parser.add_argument('--watch', action='store_true',
+                        help="Build, then rebuild a package whenever its manuscript, scripts or figures are saved "
+                             "(Linux inotify). Targets limit which packages are watched.")
+    args = parser.parse_args()
+
+    if args.watch:
+        from press_watch import PackageWatcher
+
+        folders = [package[0] for package in UniversalPressMaster.archive_packages()]
+        try:
+            watched = sorted({node.partition(':')[0] for node in UniversalPressMaster.resolve_targets(args.targets, folders)})
+        except ValueError as e:
+            parser.error(str(e))
+        # Every build option except the targets is passed on to each package rebuild
+        build_args = [flag for flag, on in (('--no-cache', args.no_cache), ('--no-formats', args.no_formats),
+                                            ('--no-devtools', args.no_devtools), ('--scratch', args.scratch)) if on]
+        build_args += ['--timeout', str(args.timeout)]
+        if args.jobs:
+            build_args += ['--jobs', str(args.jobs)]
+        if args.scratch_dir:
+            build_args += ['--scratch-dir', args.scratch_dir]
+        if args.trace:
+            build_args += ['--trace', args.trace]
+        PackageWatcher(__file__, "Millennium_Prize_Solutions_MASTER", watched, build_args).run()
+        sys.exit(0)
+
+    press = UniversalPressMaster(
+        use_cache=not args.no_cache, use_formats=not args.no_formats, trace_path=args.trace,
+        timeout=args.timeout, use_devtools=not args.no_devtools,
+        scratch=args.scratch_dir if args.scratch_dir else ('' if args.scratch else None)
+    )
+    try:
+        press.run(jobs=args.jobs, targets=args.targets, force=args.force)
+    except ValueError as e:
+        parser.error(str(e))
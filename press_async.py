@@ -0,0 +1,60 @@
+import asyncio
+import os
+import signal
+import subprocess
+
+
+# [SYSTEM CONFIGURATION: OMNIPOTENT-2]
+# [TASK: ASYNCIO SUBPROCESS ENGINE FOR OVERLAPPING CONVERSIONS]
+
+# Default wall-clock limit for any single conversion subprocess (seconds)
+DEFAULT_TIMEOUT = 600
+
+
+async def run_process(cmd, cwd=None, timeout=DEFAULT_TIMEOUT, check=True, log_path=None, passthrough=False):
+    """
+    asyncio counterpart of subprocess.run(cmd, check=..., stdout/stderr=DEVNULL); with `log_path`,
+    stdout and stderr are captured to that file instead, and with `passthrough` the child
+    writes to this process's own stdout/stderr.
+
+    The child is killed if it outlives `timeout` (raising subprocess.TimeoutExpired) or if the
+    awaiting task is cancelled, so an abandoned build never keeps running in the background.
+    Returns the exit code; raises CalledProcessError on failure when `check` is set.
+    """
+    # Own process group on POSIX so killing latexmk/tectonic also takes down the engines they spawn
+    log = open(log_path, 'wb') if log_path else None
+    if passthrough:
+        stdout = stderr = None
+    else:
+        stdout, stderr = log or subprocess.DEVNULL, subprocess.STDOUT if log else subprocess.DEVNULL
+    try:
+        proc = await asyncio.create_subprocess_exec(
+            *cmd, cwd=cwd, stdin=subprocess.DEVNULL, stdout=stdout, stderr=stderr,
+            start_new_session=(os.name == 'posix')
+        )
+        try:
+            returncode = await asyncio.wait_for(proc.wait(), timeout)
+        except asyncio.TimeoutError:
+            await _kill(proc)
+            raise subprocess.TimeoutExpired(cmd, timeout)
+        except asyncio.CancelledError:
+            await _kill(proc)
+            raise
+    finally:
+        if log is not None:
+            log.close()
+    if check and returncode != 0:
+        raise subprocess.CalledProcessError(returncode, cmd)
+    return returncode
+
+
+async def _kill(proc):
+    if proc.returncode is None:
+        try:
+            if os.name == 'posix':
+                os.killpg(proc.pid, signal.SIGKILL)
+            else:
+                proc.kill()
+        except (ProcessLookupError, PermissionError):
+            pass
+        await proc.wait()
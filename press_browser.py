@@ -0,0 +1,298 @@
+import base64
+import json
+import os
+import shutil
+import socket
+import struct
+import subprocess
+import tempfile
+import threading
+import time
+from pathlib import Path
+from urllib.parse import urlparse
+
+
+# [SYSTEM CONFIGURATION: OMNIPOTENT-2]
+# [TASK: PERSISTENT HEADLESS-BROWSER PRINT SESSION (CHROME DEVTOOLS PROTOCOL)]
+
+STARTUP_TIMEOUT = 30
+PRINT_TIMEOUT = 120
+# Upper bound on waiting for MathJax typesetting once the page has loaded (milliseconds)
+MATHJAX_TIMEOUT_MS = 30000
+
+# Resolves once MathJax (v2 or v3) has typeset the page and web fonts are ready.
+# Pages without a MathJax <script> resolve immediately.
+WAIT_FOR_TYPESET_JS = """
+(async () => {
+  const deadline = Date.now() + %d;
+  const hasMathJax = !!document.querySelector('script[src*="mathjax" i]');
+  while (hasMathJax && Date.now() < deadline) {
+    const mj = window.MathJax;
+    if (mj && mj.startup && mj.startup.promise) { await mj.startup.promise; break; }
+    if (mj && mj.Hub && mj.Hub.Queue) { await new Promise(r => mj.Hub.Queue([r])); break; }
+    await new Promise(r => setTimeout(r, 50));
+  }
+  if (document.fonts && document.fonts.ready) { await document.fonts.ready; }
+  return true;
+})()
+""" % MATHJAX_TIMEOUT_MS
+
+
+class DevToolsError(Exception):
+    pass
+
+
+class _WebSocket:
+    """Minimal RFC 6455 client: text frames only, enough for one local DevTools connection."""
+
+    def __init__(self, url, timeout=STARTUP_TIMEOUT):
+        parsed = urlparse(url)
+        self.sock = socket.create_connection((parsed.hostname, parsed.port), timeout=timeout)
+        key = base64.b64encode(os.urandom(16)).decode('ascii')
+        request = (
+            f"GET {parsed.path or '/'} HTTP/1.1\r\nHost: {parsed.hostname}:{parsed.port}\r\n"
+            "Upgrade: websocket\r\nConnection: Upgrade\r\n"
+            f"Sec-WebSocket-Key: {key}\r\nSec-WebSocket-Version: 13\r\n\r\n"
+        )
+        self.sock.sendall(request.encode('ascii'))
+        response = b''
+        while b'\r\n\r\n' not in response:
+            chunk = self.sock.recv(4096)
+            if not chunk:
+                raise DevToolsError("DevTools endpoint closed during handshake")
+            response += chunk
+        header, _, self._buffer = response.partition(b'\r\n\r\n')
+        if b' 101 ' not in header.split(b'\r\n', 1)[0]:
+            raise DevToolsError(f"WebSocket upgrade refused: {header[:80]!r}")
+        self.sock.settimeout(None)
+        self._send_lock = threading.Lock()
+
+    def _read_exact(self, n):
+        while len(self._buffer) < n:
+            chunk = self.sock.recv(max(65536, n - len(self._buffer)))
+            if not chunk:
+                raise DevToolsError("DevTools connection closed")
+            self._buffer += chunk
+        data, self._buffer = self._buffer[:n], self._buffer[n:]
+        return data
+
+    def _send_frame(self, opcode, payload):
+        header = bytes([0x80 | opcode])
+        length = len(payload)
+        if length < 126:
+            header += bytes([0x80 | length])
+        elif length < 1 << 16:
+            header += bytes([0x80 | 126]) + struct.pack('!H', length)
+        else:
+            header += bytes([0x80 | 127]) + struct.pack('!Q', length)
+        mask = os.urandom(4)
+        masked = bytes(b ^ mask[i % 4] for i, b in enumerate(payload))
+        with self._send_lock:
+            self.sock.sendall(header + mask + masked)
+
+    def send(self, text):
+        self._send_frame(0x1, text.encode('utf-8'))
+
+    def recv(self):
+        """Returns the next complete text message."""
+        parts = []
+        while True:
+            first, second = self._read_exact(2)
+            opcode, length = first & 0x0F, second & 0x7F
+            if length == 126:
+                length = struct.unpack('!H', self._read_exact(2))[0]
+            elif length == 127:
+                length = struct.unpack('!Q', self._read_exact(8))[0]
+            mask = self._read_exact(4) if second & 0x80 else None
+            payload = self._read_exact(length)
+            if mask:
+                payload = bytes(b ^ mask[i % 4] for i, b in enumerate(payload))
+            if opcode == 0x8:
+                raise DevToolsError("DevTools connection closed by browser")
+            if opcode == 0x9:
+                self._send_frame(0xA, payload)
+                continue
+            if opcode in (0x0, 0x1):
+                parts.append(payload)
+                if first & 0x80:
+                    return b''.join(parts).decode('utf-8')
+
+    def close(self):
+        try:
+            self.sock.close()
+        except OSError:
+            pass
+
+
+class _Pending:
+    def __init__(self):
+        self.event = threading.Event()
+        self.message = None
+
+
+class BrowserPrintSession:
+    """
+    One headless Chromium/Edge process driven over the DevTools protocol for a whole build.
+
+    Every print opens a fresh tab, loads the HTML, waits until MathJax has finished typesetting
+    (instead of a fixed virtual-time budget), calls Page.printToPDF and closes the tab. The
+    session is thread-safe: package workers may print concurrently through it.
+    """
+
+    def __init__(self, browser):
+        self.browser = browser
+        self.proc = None
+        self.ws = None
+        self._profile = None
+        self._next_id = 0
+        self._lock = threading.Lock()
+        self._pending = {}
+        self._waiters = {}
+        self._reader = None
+        self._closed = False
+
+    # -- lifecycle ---------------------------------------------------------
+
+    def start(self):
+        self._profile = tempfile.mkdtemp(prefix='press_browser_')
+        cmd = [
+            self.browser, '--headless=new', '--disable-gpu', '--remote-debugging-port=0',
+            f'--user-data-dir={self._profile}', '--no-first-run', '--no-default-browser-check',
+            '--disable-extensions', 'about:blank'
+        ]
+        if os.name == 'posix' and hasattr(os, 'geteuid') and os.geteuid() == 0:
+            cmd.insert(1, '--no-sandbox')
+        self.proc = subprocess.Popen(cmd, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+        # The browser writes "<port>\n<browser target path>" once the DevTools server is up
+        port_file = os.path.join(self._profile, 'DevToolsActivePort')
+        deadline = time.monotonic() + STARTUP_TIMEOUT
+        lines = []
+        while time.monotonic() < deadline:
+            if self.proc.poll() is not None:
+                raise DevToolsError(f"{self.browser} exited during startup ({self.proc.returncode})")
+            try:
+                with open(port_file, 'r', encoding='utf-8') as f:
+                    lines = f.read().split()
+            except OSError:
+                lines = []
+            if len(lines) >= 2:
+                break
+            time.sleep(0.05)
+        else:
+            raise DevToolsError("Timed out waiting for the DevTools endpoint")
+
+        self.ws = _WebSocket(f"ws://127.0.0.1:{lines[0]}{lines[1]}")
+        self._reader = threading.Thread(target=self._read_loop, name='devtools-reader', daemon=True)
+        self._reader.start()
+        return self
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        if self.ws is not None:
+            try:
+                self.call('Browser.close', timeout=5)
+            except Exception:
+                pass
+            self.ws.close()
+        if self.proc is not None:
+            try:
+                self.proc.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self.proc.kill()
+                self.proc.wait()
+        if self._profile:
+            shutil.rmtree(self._profile, ignore_errors=True)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # -- protocol ------------------------------------------------------------
+
+    def _read_loop(self):
+        try:
+            while True:
+                message = json.loads(self.ws.recv())
+                with self._lock:
+                    if 'id' in message:
+                        pending = self._pending.pop(message['id'], None)
+                    else:
+                        pending = self._waiters.pop((message.get('sessionId'), message.get('method')), None)
+                if pending is not None:
+                    pending.message = message
+                    pending.event.set()
+        except Exception:
+            # Connection gone: fail every outstanding call instead of leaving it hanging
+            with self._lock:
+                stranded = list(self._pending.values()) + list(self._waiters.values())
+                self._pending.clear()
+                self._waiters.clear()
+            for pending in stranded:
+                pending.event.set()
+
+    def _send(self, method, params=None, session_id=None):
+        pending = _Pending()
+        with self._lock:
+            self._next_id += 1
+            message_id = self._next_id
+            self._pending[message_id] = pending
+        message = {'id': message_id, 'method': method, 'params': params or {}}
+        if session_id:
+            message['sessionId'] = session_id
+        self.ws.send(json.dumps(message))
+        return message_id, pending
+
+    def call(self, method, params=None, session_id=None, timeout=PRINT_TIMEOUT):
+        message_id, pending = self._send(method, params, session_id)
+        if not pending.event.wait(timeout):
+            with self._lock:
+                self._pending.pop(message_id, None)
+            raise DevToolsError(f"{method} timed out")
+        if pending.message is None:
+            raise DevToolsError(f"{method}: DevTools connection lost")
+        if 'error' in pending.message:
+            raise DevToolsError(f"{method}: {pending.message['error'].get('message')}")
+        return pending.message.get('result', {})
+
+    def _expect(self, method, session_id):
+        pending = _Pending()
+        with self._lock:
+            self._waiters[(session_id, method)] = pending
+        return pending
+
+    # -- printing ------------------------------------------------------------
+
+    def print_to_pdf(self, html_path, pdf_path, timeout=PRINT_TIMEOUT):
+        """Renders `html_path` and writes it to `pdf_path` (atomically). Returns the PDF size."""
+        target = self.call('Target.createTarget', {'url': 'about:blank'})['targetId']
+        try:
+            session = self.call('Target.attachToTarget', {'targetId': target, 'flatten': True})['sessionId']
+            self.call('Page.enable', session_id=session)
+            loaded = self._expect('Page.loadEventFired', session)
+            self.call('Page.navigate', {'url': Path(html_path).resolve().as_uri()}, session_id=session)
+            if not loaded.event.wait(timeout) or loaded.message is None:
+                raise DevToolsError(f"Timed out loading {html_path}")
+            self.call(
+                'Runtime.evaluate', {'expression': WAIT_FOR_TYPESET_JS, 'awaitPromise': True},
+                session_id=session, timeout=timeout
+            )
+            result = self.call(
+                'Page.printToPDF', {'printBackground': True, 'preferCSSPageSize': True},
+                session_id=session, timeout=timeout
+            )
+        finally:
+            try:
+                self.call('Target.closeTarget', {'targetId': target}, timeout=10)
+            except Exception:
+                pass
+        data = base64.b64decode(result['data'])
+        tmp = f"{pdf_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, 'wb') as f:
+            f.write(data)
+        os.replace(tmp, pdf_path)
+        return len(data)
@@ -0,0 +1,208 @@
+import hashlib
+import json
+import os
+import re
+import shutil
+import threading
+import time
+import uuid
+
+
+# [SYSTEM CONFIGURATION: OMNIPOTENT-2]
+# [TASK: CONTENT-ADDRESSED BUILD CACHE FOR THE PRESS]
+
+INCLUDEGRAPHICS_RE = re.compile(r'\\includegraphics\s*(?:\[[^\]]*\])?\s*\{([^}]+)\}')
+FIGURE_EXTENSIONS = ['', '.pdf', '.png', '.jpg', '.jpeg', '.eps']
+
+
+def hash_file(path, chunk_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def write_if_changed(path, content):
+    """
+    Writes `content` (str, as UTF-8, or bytes) to `path` unless the file already holds exactly
+    those bytes (same size, then same SHA-256), so unchanged artifacts keep their mtime.
+    Returns the number of bytes skipped: 0 when the file was (re)written.
+    """
+    data = content.encode('utf-8') if isinstance(content, str) else content
+    try:
+        if os.path.getsize(path) == len(data) and hash_file(path) == hashlib.sha256(data).hexdigest():
+            return len(data)
+    except OSError:
+        pass
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, 'wb') as f:
+        f.write(data)
+    os.replace(tmp, path)
+    return 0
+
+
+def same_content(path_a, path_b):
+    """True when both files exist with the same size and SHA-256."""
+    try:
+        if os.path.getsize(path_a) != os.path.getsize(path_b):
+            return False
+    except OSError:
+        return False
+    return hash_file(path_a) == hash_file(path_b)
+
+
+def referenced_figures(latex_content):
+    return [name.strip() for name in INCLUDEGRAPHICS_RE.findall(latex_content)]
+
+
+def resolve_figure(name, base_dir):
+    """Finds the file pdflatex would load for an \\includegraphics target, or None."""
+    for ext in FIGURE_EXTENSIONS:
+        candidate = os.path.join(base_dir, name + ext)
+        if os.path.isfile(candidate):
+            return candidate
+    return None
+
+
+def source_key(latex_content, base_dir, toolchain=''):
+    """
+    Cache key for one manuscript: the LaTeX source, the bytes of every figure it includes
+    (resolved relative to the package folder) and the toolchain fingerprint.
+    """
+    digest = hashlib.sha256()
+    digest.update(latex_content.encode('utf-8'))
+    for name in referenced_figures(latex_content):
+        figure = resolve_figure(name, base_dir)
+        digest.update(f"\0figure:{name}:".encode('utf-8'))
+        digest.update((hash_file(figure) if figure else 'missing').encode('utf-8'))
+    digest.update(b"\0toolchain:" + toolchain.encode('utf-8'))
+    return digest.hexdigest()
+
+
+class BuildCache:
+    """
+    Persistent store of compiled artifacts keyed by source_key(): the PDF and the DOCX of a
+    manuscript share one entry, each added when its build node finishes.
+    Layout: <cache_dir>/<key[:2]>/<key>/{entry.json, <artifact files>}
+    """
+
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+        self._lock = threading.Lock()
+
+    def _entry_dir(self, key):
+        return os.path.join(self.cache_dir, key[:2], key)
+
+    def lookup(self, key):
+        """Returns {artifact name: cached file path} for a complete entry, or None."""
+        entry_dir = self._entry_dir(key)
+        try:
+            with open(os.path.join(entry_dir, 'entry.json'), 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        files = {name: os.path.join(entry_dir, fname) for name, fname in entry.get('artifacts', {}).items()}
+        if not files or not all(os.path.isfile(p) for p in files.values()):
+            return None
+        return files
+
+    def restore(self, key, targets):
+        """
+        Copies cached artifacts to their destinations ({artifact name: destination path}).
+        Destinations that already hold the same bytes are left untouched; the rest are replaced
+        through a temporary file, never rewritten in place. Returns False on a miss, i.e. when
+        any requested artifact is not cached.
+        """
+        files = self.lookup(key)
+        if files is None or not all(name in files for name in targets):
+            return False
+        for name, dest in targets.items():
+            cached = files[name]
+            if same_content(dest, cached):
+                continue
+            tmp = f"{dest}.{os.getpid()}.{threading.get_ident()}.tmp"
+            shutil.copy2(cached, tmp)
+            os.replace(tmp, dest)
+        return True
+
+    def store(self, key, artifacts):
+        """
+        Stores {artifact name: produced file path} in the entry for `key`, keeping the artifacts
+        it already holds under other names; missing or empty files are skipped.
+        """
+        artifacts = {name: p for name, p in artifacts.items() if os.path.exists(p) and os.path.getsize(p) > 0}
+        if not artifacts:
+            return
+        with self._lock:
+            self._store(key, {**(self.lookup(key) or {}), **artifacts})
+
+    def _store(self, key, artifacts):
+        entry_dir = self._entry_dir(key)
+        # Assemble in a private directory, then rename into place so readers never see half an entry
+        staging = f"{entry_dir}.{uuid.uuid4().hex}.tmp"
+        os.makedirs(staging)
+        try:
+            entry = {'artifacts': {}}
+            for name, src in artifacts.items():
+                fname = name + os.path.splitext(src)[1]
+                shutil.copy2(src, os.path.join(staging, fname))
+                entry['artifacts'][name] = fname
+            with open(os.path.join(staging, 'entry.json'), 'w', encoding='utf-8') as f:
+                json.dump(entry, f, indent=2)
+            if os.path.isdir(entry_dir):
+                shutil.rmtree(entry_dir, ignore_errors=True)
+            os.replace(staging, entry_dir)
+        finally:
+            if os.path.isdir(staging):
+                shutil.rmtree(staging, ignore_errors=True)
+
+
+class FailureCache:
+    """
+    Persistent record of PDF backends known to fail on a given manuscript.
+
+    Entries are keyed on (backend, backend version, source hash), so editing the manuscript or
+    its figures, or upgrading the tool, retries the backend automatically. Each entry keeps the
+    failure reason and when it was first seen. Layout: one JSON file, rewritten atomically.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                self._entries = json.load(f).get('failures', {})
+        except (OSError, ValueError):
+            self._entries = {}
+
+    @staticmethod
+    def _key(backend, version, source_hash):
+        return hashlib.sha256(f"{backend}\0{version}\0{source_hash}".encode('utf-8')).hexdigest()
+
+    def lookup(self, backend, version, source_hash):
+        """Returns the recorded entry ({backend, reason, since}) or None."""
+        with self._lock:
+            return self._entries.get(self._key(backend, version, source_hash))
+
+    def record(self, backend, version, source_hash, reason):
+        key = self._key(backend, version, source_hash)
+        with self._lock:
+            previous = self._entries.get(key, {})
+            self._entries[key] = {
+                'backend': backend, 'reason': reason,
+                'since': previous.get('since') or time.strftime('%Y-%m-%d %H:%M'),
+            }
+            self._save()
+
+    def clear(self, backend, version, source_hash):
+        with self._lock:
+            if self._entries.pop(self._key(backend, version, source_hash), None) is not None:
+                self._save()
+
+    def _save(self):
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        tmp = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({'failures': self._entries}, f, indent=1, sort_keys=True)
+        os.replace(tmp, self.path)
@@ -0,0 +1,193 @@
+import argparse
+import hashlib
+import inspect
+import marshal
+import os
+import shutil
+import sys
+import threading
+
+from press_cache import write_if_changed
+from press_figures import output_files, save_figure
+
+
+# [SYSTEM CONFIGURATION: OMNIPOTENT-2]
+# [TASK: PARAMETER-HASHED FIGURE CACHE FOR THE VISUAL PROOFS]
+
+REPO_ROOT = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_FIGURE_CACHE = os.path.join(REPO_ROOT, 'Millennium_Prize_Solutions_MASTER', '.press_cache', 'figures')
+# Renders kept per figure, so switching between recent variants is still a hit
+KEEP_PER_FIGURE = 4
+# Settings that pick the output device or the GUI, not how the figure looks
+RC_IGNORED_PREFIXES = ('backend', 'interactive', 'webagg.', 'tk.', 'macosx.', 'savefig.directory', 'toolbar')
+
+
+def _feed(digest, value):
+    """Hashes plotted inputs: numpy arrays by dtype, shape and raw bytes; containers recursively."""
+    if hasattr(value, 'dtype') and hasattr(value, 'tobytes'):
+        digest.update(f"array:{value.dtype.str}:{getattr(value, 'shape', ())}:".encode('utf-8'))
+        try:
+            # Contiguous arrays (memory-mapped tables included) are hashed in place, without a copy
+            digest.update(memoryview(value).cast('B'))
+        except (TypeError, ValueError):
+            digest.update(value.tobytes(order='C'))
+    elif isinstance(value, (list, tuple)):
+        digest.update(f"{type(value).__name__}:{len(value)}:".encode('utf-8'))
+        for item in value:
+            _feed(digest, item)
+    elif isinstance(value, dict):
+        digest.update(f"dict:{len(value)}:".encode('utf-8'))
+        for k in sorted(value, key=repr):
+            _feed(digest, k)
+            _feed(digest, value[k])
+    elif callable(value):
+        # A plotting function stands for its styling: labels, colours, sizes and dpi are literals in it
+        try:
+            digest.update(inspect.getsource(value).encode('utf-8'))
+        except (OSError, TypeError):
+            digest.update(marshal.dumps(value.__code__))
+    else:
+        digest.update(f"{type(value).__name__}:{value!r};".encode('utf-8'))
+
+
+def _as_list(image_paths):
+    return [image_paths] if isinstance(image_paths, str) else list(image_paths)
+
+
+def _style():
+    """matplotlib's version and every rcParam that affects the rendered image."""
+    import matplotlib
+    return [matplotlib.__version__] + sorted(
+        f"{k}={v!r}" for k, v in matplotlib.rcParams.items() if not k.startswith(RC_IGNORED_PREFIXES)
+    )
+
+
+class FigureCache:
+    """
+    Finished figure images keyed on a hash of what was plotted: the data arrays, the
+    plotting function's source (labels, colours, sizes, dpi), the matplotlib version and
+    the active rcParams. On a hit the stored render is reused instead of calling savefig;
+    an image that already holds those bytes is left untouched, so its mtime stays put.
+
+    A figure saved in several formats (see press_figures.output_files) is cached as a set.
+    Layout: <cache>/<figure stem>/<key><ext>, keeping the last few renders of each figure.
+    `python press_figcache.py clear` invalidates everything (or only the named figures).
+    """
+
+    def __init__(self, cache_dir=DEFAULT_FIGURE_CACHE):
+        self.cache_dir = cache_dir
+        self._lock = threading.Lock()
+
+    def key(self, image_paths, *inputs):
+        digest = hashlib.sha256()
+        _feed(digest, [os.path.basename(p) for p in _as_list(image_paths)])
+        _feed(digest, _style())
+        for value in inputs:
+            _feed(digest, value)
+        return digest.hexdigest()
+
+    def _entry(self, image_path, key):
+        stem, ext = os.path.splitext(os.path.basename(image_path))
+        return os.path.join(self.cache_dir, stem, key + ext)
+
+    def restore(self, image_paths, key):
+        """Puts the cached render for `key` at each of `image_paths`; False on a miss."""
+        paths = _as_list(image_paths)
+        renders = []
+        for path in paths:
+            try:
+                with open(self._entry(path, key), 'rb') as f:
+                    renders.append(f.read())
+            except OSError:
+                return False
+        states = []
+        for path, data in zip(paths, renders):
+            states.append("already current" if write_if_changed(path, data) else "restored")
+            os.utime(self._entry(path, key))
+        names = ", ".join(f"{os.path.basename(p)} {state}" for p, state in zip(paths, states))
+        print(f">> [FIGURE CACHE] HIT {key[:12]}: {names}; render skipped")
+        return True
+
+    def store(self, image_paths, key):
+        """Records a fresh render under `key`, pruning each figure's oldest renders."""
+        for image_path in _as_list(image_paths):
+            entry = self._entry(image_path, key)
+            folder = os.path.dirname(entry)
+            os.makedirs(folder, exist_ok=True)
+            tmp = f"{entry}.{os.getpid()}.{threading.get_ident()}.tmp"
+            shutil.copyfile(image_path, tmp)
+            os.replace(tmp, entry)
+            with self._lock:
+                renders = sorted(
+                    (os.path.join(folder, name) for name in os.listdir(folder) if not name.endswith('.tmp')),
+                    key=os.path.getmtime, reverse=True
+                )
+                # Each format of a figure is pruned on its own
+                renders = [r for r in renders if r.endswith(os.path.splitext(entry)[1])]
+                for old in renders[KEEP_PER_FIGURE:]:
+                    try:
+                        os.remove(old)
+                    except OSError:
+                        pass
+
+    def entries(self):
+        """{figure stem: [(file name, size), ...]} for everything in the cache."""
+        listing = {}
+        if os.path.isdir(self.cache_dir):
+            for stem in sorted(os.listdir(self.cache_dir)):
+                folder = os.path.join(self.cache_dir, stem)
+                if os.path.isdir(folder):
+                    listing[stem] = [(name, os.path.getsize(os.path.join(folder, name)))
+                                     for name in sorted(os.listdir(folder))]
+        return listing
+
+    def clear(self, names=()):
+        """Drops the cached renders of `names` (file names or stems), or of every figure. Returns the count."""
+        stems = [os.path.splitext(os.path.basename(n))[0] for n in names] or list(self.entries())
+        removed = 0
+        for stem in stems:
+            folder = os.path.join(self.cache_dir, stem)
+            if os.path.isdir(folder):
+                removed += len(os.listdir(folder))
+                shutil.rmtree(folder, ignore_errors=True)
+        return removed
+
+
+def save_cached_figure(fig, image_name, plot_function, *inputs, **savefig_kwargs):
+    """
+    Saves a generator's visual proof as the files of the selected format (press_figures),
+    300 dpi with a tight bounding box unless told otherwise, reusing the last render while
+    `inputs`, `plot_function`'s source and the matplotlib style are unchanged. Returns the files.
+    """
+    figure_files = output_files(image_name)
+    cache = FigureCache()
+    key = cache.key(figure_files, plot_function, *inputs)
+    if not cache.restore(figure_files, key):
+        save_figure(fig, figure_files, **{'dpi': 300, 'bbox_inches': 'tight', **savefig_kwargs})
+        cache.store(figure_files, key)
+    return figure_files
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Inspect or invalidate the figure cache of the visual proofs.")
+    parser.add_argument('command', choices=['list', 'clear'],
+                        help="list: cached renders per figure; clear: invalidate them so the next run re-renders.")
+    parser.add_argument('figures', nargs='*', help="Figure file names or stems, e.g. spectral_staircase.png (default: all).")
+    parser.add_argument('--cache', default=DEFAULT_FIGURE_CACHE, help="Cache directory.")
+    args = parser.parse_args()
+
+    cache = FigureCache(args.cache)
+    if args.command == 'clear':
+        print(f">> [FIGURE CACHE] Removed {cache.clear(args.figures)} cached render(s)")
+    else:
+        listing = cache.entries()
+        if args.figures:
+            wanted = {os.path.splitext(os.path.basename(n))[0] for n in args.figures}
+            listing = {stem: files for stem, files in listing.items() if stem in wanted}
+        for stem, files in listing.items():
+            print(f">> [FIGURE CACHE] {stem}")
+            for name, size in files:
+                print(f"   {size:>9}  {name}")
+        if not listing:
+            print(">> [FIGURE CACHE] empty")
+    sys.exit(0)
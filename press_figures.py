@@ -0,0 +1,99 @@
+import os
+import re
+
+from press_cache import INCLUDEGRAPHICS_RE
+
+
+# [SYSTEM CONFIGURATION: OMNIPOTENT-2]
+# [TASK: VECTOR FIGURE OUTPUT FOR THE LATEX PIPELINE]
+
+FIGURE_FORMATS = ['png', 'pdf', 'svg']
+DEFAULT_FORMAT = 'png'
+# Selects the format for every generator run in this process (press_generate.py --figure-format sets it)
+FORMAT_ENV = 'PRESS_FIGURE_FORMAT'
+# An artist with more vertices than this is rasterized inside a vector figure; everything else stays vector
+DENSE_ARTIST_POINTS = 5000
+RASTER_IMAGE_RE = re.compile(r'\.png$', re.IGNORECASE)
+
+
+def figure_format():
+    fmt = os.environ.get(FORMAT_ENV, DEFAULT_FORMAT).strip().lower()
+    return fmt if fmt in FIGURE_FORMATS else DEFAULT_FORMAT
+
+
+def output_files(image_name, fmt=None):
+    """
+    The files a figure is saved as, manuscript copy first. pdflatex cannot read SVG, so the
+    svg format writes a PDF for the manuscript next to the SVG for web and DOCX use.
+    """
+    fmt = fmt or figure_format()
+    stem = os.path.splitext(image_name)[0]
+    if fmt == 'svg':
+        return [stem + '.pdf', stem + '.svg']
+    return [f"{stem}.{fmt}"]
+
+
+def use_figure_format(latex_content, fmt=None):
+    """Points every PNG \\includegraphics target of a manuscript at the selected figure format."""
+    fmt = fmt or figure_format()
+    if fmt == 'png':
+        return latex_content
+
+    def swap(match):
+        name = match.group(1).strip()
+        if not RASTER_IMAGE_RE.search(name):
+            return match.group(0)
+        text = match.group(0)
+        return text[:text.rindex('{') + 1] + output_files(name, fmt)[0] + '}'
+
+    return INCLUDEGRAPHICS_RE.sub(swap, latex_content)
+
+
+def _points(artist):
+    """Vertex count of a plotted artist, or 0 for artists that are cheap in any format."""
+    from matplotlib.collections import Collection
+    from matplotlib.lines import Line2D
+    from matplotlib.patches import Patch
+    if isinstance(artist, Line2D):
+        return len(artist.get_xydata())
+    if isinstance(artist, Collection):
+        return len(artist.get_offsets()) + sum(len(p.vertices) for p in artist.get_paths())
+    if isinstance(artist, Patch):
+        return len(artist.get_path().vertices)
+    return 0
+
+
+def rasterize_dense_artists(fig, threshold=DENSE_ARTIST_POINTS):
+    """Marks artists with more than `threshold` vertices as rasterized. Returns how many were marked."""
+    marked = 0
+    for ax in fig.axes:
+        for artist in ax.get_children():
+            if _points(artist) > threshold:
+                artist.set_rasterized(True)
+                marked += 1
+    return marked
+
+
+def save_figure(fig, paths, **savefig_kwargs):
+    """
+    Saves `fig` as each of `paths` (from output_files()). Vector outputs keep text, axes and
+    light artists as vector paths and embed only dense artists as images at the savefig dpi,
+    so the file stays small and quick for pdflatex to place.
+
+    Each file is written under a temporary name and renamed into place, so a figure that the
+    dedup store (press_store) hardlinked to its twins is replaced rather than rewritten through
+    the shared inode.
+    """
+    for path in paths:
+        if not path.lower().endswith('.png'):
+            rasterize_dense_artists(fig)
+        stem, ext = os.path.splitext(path)
+        tmp = f"{stem}.{os.getpid()}.tmp{ext}"
+        try:
+            fig.savefig(tmp, **{'format': ext[1:].lower(), **savefig_kwargs})
+            os.replace(tmp, path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+    return paths
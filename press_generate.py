@@ -0,0 +1,283 @@
+import time
+
+# Taken before anything else is imported, so the reported startup covers the whole CLI
+_STARTED = time.perf_counter()
+
+import argparse  # noqa: E402
+import concurrent.futures  # noqa: E402
+import contextlib  # noqa: E402
+import importlib.util  # noqa: E402
+import io  # noqa: E402
+import os  # noqa: E402
+import sys  # noqa: E402
+import traceback  # noqa: E402
+
+from press_figures import FIGURE_FORMATS, FORMAT_ENV, output_files  # noqa: E402
+from press_manifest import MANIFEST_NAME, ArtifactManifest  # noqa: E402
+
+
+# [SYSTEM CONFIGURATION: OMNIPOTENT-2]
+# [TASK: LAZY-IMPORT STAGE CLI FOR THE GENERATOR SCRIPTS]
+
+REPO_ROOT = os.path.dirname(os.path.abspath(__file__))
+MASTER_DIR = os.path.join(REPO_ROOT, 'Millennium_Prize_Solutions_MASTER')
+
+# The current generator of each problem folder
+GENERATORS = {
+    '01_P_vs_NP': 'generate_pnp_submission.py',
+    '02_Riemann_Hypothesis': 'submission_factory.py',
+    '03_Yang_Mills': 'generate_ym_submission_final_v4.py',
+    '04_Navier_Stokes': 'generate_ns_submission.py',
+    '05_Hodge_Conjecture': 'generate_hodge_submission.py',
+    '06_BSD_Conjecture': 'generate_bsd_submission.py',
+    '07_Poincare_Conjecture': 'generate_poincare_magazine.py',
+}
+
+# Standalone figure scripts of a package, run by watch mode alongside its generator
+FIGURE_SCRIPTS = {
+    '02_Riemann_Hypothesis': ['generate_figure_1.py'],
+}
+
+# Stage -> the generator function that runs it
+STAGE_FUNCTIONS = {
+    'figure': 'generate_visual_proof',
+    'tex': 'write_tex',
+    'pdf': 'compile_pdf',
+    'docx': 'compile_docx',
+}
+# pdf and docx compile the .tex on disk, so they write it first
+STAGE_PLANS = {
+    'figure': ['figure'],
+    'tex': ['tex'],
+    'pdf': ['tex', 'pdf'],
+    'docx': ['tex', 'docx'],
+    'all': ['figure', 'tex', 'pdf', 'docx'],
+}
+# Stage -> the module constant naming the file it writes (the figure may be saved in several formats)
+STAGE_OUTPUTS = {
+    'figure': 'IMG_FILENAME',
+    'tex': 'TEX_FILENAME',
+    'pdf': 'PDF_FILENAME',
+    'docx': 'DOCX_FILENAME',
+}
+HEAVY_MODULES = ['numpy', 'matplotlib', 'mpmath']
+
+
+def resolve_scripts(targets):
+    """Generator script paths for package folders (prefixes work, e.g. '03') or explicit .py paths."""
+    if not targets:
+        return [os.path.join(MASTER_DIR, folder, script) for folder, script in GENERATORS.items()]
+    scripts = []
+    for target in targets:
+        if target.endswith('.py'):
+            if not os.path.isfile(target):
+                raise ValueError(f"No such script: {target}")
+            scripts.append(os.path.abspath(target))
+            continue
+        matches = [f for f in GENERATORS if f == target.rstrip('/\\') or f.startswith(target)]
+        if len(matches) != 1:
+            raise ValueError(f"'{target}' matches {len(matches)} package(s); expected one of {', '.join(GENERATORS)}")
+        scripts.append(os.path.join(MASTER_DIR, matches[0], GENERATORS[matches[0]]))
+    return scripts
+
+
+def package_scripts(folder):
+    """File names of a package's runnable scripts: its current generator, then its figure scripts."""
+    return ([GENERATORS[folder]] if folder in GENERATORS else []) + FIGURE_SCRIPTS.get(folder, [])
+
+
+def load_generator(script):
+    """Imports a generator script as a module (its __main__ block does not run)."""
+    name = 'press_generator_' + os.path.splitext(os.path.basename(script))[0]
+    spec = importlib.util.spec_from_file_location(name, script)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def stage_outputs(module, script, stage):
+    """Absolute paths of the files `stage` of a loaded generator writes ([] if it names none)."""
+    name = getattr(module, STAGE_OUTPUTS[stage], None)
+    if not name:
+        return []
+    names = output_files(name) if stage == 'figure' else [name]
+    return [os.path.join(os.path.dirname(script), n) for n in names]
+
+
+def _stat(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_size, st.st_mtime_ns
+
+
+def written_outputs(paths, before):
+    """
+    The paths a stage actually wrote: present now with a size or mtime other than `before`
+    (their _stat() taken before it ran). The generators report a failed compile without
+    raising, so a PDF left over from an earlier run must not count as this run's output.
+    """
+    return [path for path, old in zip(paths, before) if _stat(path) not in (None, old)]
+
+
+def record_outputs(manifest, script, stage, paths, seconds):
+    """Lists the files a stage wrote in the MASTER manifest, so press_manifest.py verify covers them."""
+    backend = f"{os.path.basename(script)}:{stage}"
+    for path in paths:
+        manifest.record(path, backend=backend, seconds=seconds, inputs=[script])
+
+
+def heavy_loaded():
+    return [name for name in HEAVY_MODULES if name in sys.modules]
+
+
+def render_figure(script):
+    """
+    Pool worker: renders one generator's visual proof with the non-interactive Agg backend.
+    Returns (script, seconds, captured output, error or None, figure files it wrote).
+
+    A worker process can render several figures in turn, so pyplot's global state (open
+    figures, rcParams changed by an earlier script) is reset before and after each one.
+    """
+    os.environ['MPLBACKEND'] = 'Agg'
+    output = io.StringIO()
+    start = time.perf_counter()
+    error = None
+    outputs = []
+    cwd = os.getcwd()
+    try:
+        with contextlib.redirect_stdout(output):
+            import matplotlib
+            matplotlib.use('Agg', force=True)
+            import matplotlib.pyplot as plt
+            plt.close('all')
+            matplotlib.rcdefaults()
+            os.chdir(os.path.dirname(script))
+            try:
+                module = load_generator(script)
+                outputs = stage_outputs(module, script, 'figure')
+                before = [_stat(path) for path in outputs]
+                module.generate_visual_proof()
+                outputs = written_outputs(outputs, before)
+            finally:
+                plt.close('all')
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+        if not isinstance(e, (AttributeError, ImportError)):
+            output.write(traceback.format_exc())
+    finally:
+        os.chdir(cwd)
+    return script, time.perf_counter() - start, output.getvalue(), error, outputs
+
+
+def render_figures(scripts, jobs=None):
+    """
+    Renders every script's figure in a process pool (one worker per CPU core by default),
+    printing each figure's output as one block as it finishes.
+    Returns {script: (seconds, error, figure files)}.
+    """
+    jobs = max(1, min(jobs or os.cpu_count() or 1, len(scripts)))
+    results = {}
+    with concurrent.futures.ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = [pool.submit(render_figure, script) for script in scripts]
+        for future in concurrent.futures.as_completed(futures):
+            script, seconds, output, error, outputs = future.result()
+            label = os.path.relpath(script, REPO_ROOT)
+            print(f">> [FIGURE] {label} ({seconds:.2f}s)")
+            for line in output.splitlines():
+                print(f"   {line}")
+            if error:
+                print(f">> [FIGURE] {label}: {error}")
+            results[script] = (seconds, error, outputs)
+    return results
+
+
+def run_stages(script, stages):
+    """
+    Runs `stages` of one generator inside its own folder (the scripts write relative paths).
+    Returns ({stage: seconds}, {stage: files it wrote}); raises AttributeError if the script
+    lacks a stage function.
+    """
+    cwd = os.getcwd()
+    os.chdir(os.path.dirname(script))
+    try:
+        start = time.perf_counter()
+        module = load_generator(script)
+        timings = {'load': time.perf_counter() - start}
+        outputs = {}
+        missing = [STAGE_FUNCTIONS[s] for s in stages if not callable(getattr(module, STAGE_FUNCTIONS[s], None))]
+        if missing:
+            raise AttributeError(f"{os.path.basename(script)} has no {', '.join(missing)}()")
+        for stage in stages:
+            paths = stage_outputs(module, script, stage)
+            before = [_stat(path) for path in paths]
+            start = time.perf_counter()
+            getattr(module, STAGE_FUNCTIONS[stage])()
+            timings[stage] = time.perf_counter() - start
+            outputs[stage] = written_outputs(paths, before)
+        return timings, outputs
+    finally:
+        os.chdir(cwd)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Run single stages of the generator scripts; plotting libraries load only for 'figure'."
+    )
+    parser.add_argument('stage', choices=list(STAGE_PLANS),
+                        help="figure: render the visual proof; tex: write the manuscript; pdf / docx: write "
+                             "the manuscript and compile it; all: every stage (what running a script does).")
+    parser.add_argument('targets', nargs='*',
+                        help="Package folders or prefixes (e.g. 03) or generator .py paths (default: every package).")
+    parser.add_argument('--figure-format', choices=FIGURE_FORMATS, default=None,
+                        help="Figure output: png (300 dpi), pdf (vector) or svg (vector, plus a PDF for the "
+                             "manuscript); manuscripts reference the matching file. Default: $PRESS_FIGURE_FORMAT or png.")
+    parser.add_argument('-j', '--jobs', type=int, default=None,
+                        help="Figure render processes (default: one per CPU core).")
+    args = parser.parse_args()
+
+    try:
+        scripts = resolve_scripts(args.targets)
+    except ValueError as e:
+        parser.error(str(e))
+    stages = STAGE_PLANS[args.stage]
+    if args.figure_format:
+        # Read by the generators at import time, here and in the figure workers
+        os.environ[FORMAT_ENV] = args.figure_format
+    print(f">> [GENERATE] CLI ready in {(time.perf_counter() - _STARTED) * 1000:.0f} ms")
+
+    manifest = ArtifactManifest(os.path.join(MASTER_DIR, MANIFEST_NAME))
+    failed = False
+    if 'figure' in stages:
+        # Figures render in parallel up front; the remaining stages run per script below
+        stages = [stage for stage in stages if stage != 'figure']
+        start = time.perf_counter()
+        figures = render_figures(scripts, args.jobs)
+        print(f">> [FIGURE] {len(figures)} figure(s) in {time.perf_counter() - start:.2f}s wall time:")
+        for script in scripts:
+            seconds, error, outputs = figures[script]
+            print(f"   {seconds:7.2f}s  {'FAILED' if error else 'ok':<6}  {os.path.relpath(script, REPO_ROOT)}")
+            if not error:
+                record_outputs(manifest, script, 'figure', outputs, seconds)
+        failed = any(error for _, error, _ in figures.values())
+
+    for script in scripts if stages else []:
+        label = os.path.relpath(script, REPO_ROOT)
+        print(f">> [GENERATE] {label}: {' -> '.join(stages)}")
+        try:
+            timings, outputs = run_stages(script, stages)
+        except (AttributeError, ImportError) as e:
+            # A missing stage function, or a plotting library that is not installed
+            print(f">> [GENERATE] {label}: {type(e).__name__}: {e}")
+            failed = True
+            continue
+        for stage, paths in outputs.items():
+            record_outputs(manifest, script, stage, paths, timings[stage])
+        heavy = heavy_loaded()
+        stage_times = ", ".join(f"{stage} {seconds:.2f}s" for stage, seconds in timings.items())
+        print(f">> [GENERATE] {label}: {stage_times}; heavy modules loaded: {', '.join(heavy) or 'none'}")
+    manifest.save()
+    print(f">> [MANIFEST] {len(manifest.artifacts)} artifact(s) indexed in {manifest.path}")
+    print(f">> [GENERATE] Total {time.perf_counter() - _STARTED:.2f}s")
+    sys.exit(1 if failed else 0)
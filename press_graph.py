@@ -0,0 +1,168 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from press_cache import hash_file
+
+
+# [SYSTEM CONFIGURATION: OMNIPOTENT-2]
+# [TASK: DEPENDENCY-GRAPH BUILD ENGINE WITH TARGETED REBUILDS]
+
+# Node states after a build: up to date without running, (re)built, action failed, dependency failed
+FRESH, BUILT, FAILED, BLOCKED = 'fresh', 'built', 'failed', 'blocked'
+
+
+class Node:
+    """
+    One artifact in the build graph.
+
+    `action()` produces `outputs` and returns True on success; a node without an action is a
+    source whose outputs already exist (e.g. figures). `key` holds everything besides the
+    dependencies' output bytes that determines the result, such as the tool version.
+    """
+
+    def __init__(self, name, action=None, deps=(), outputs=(), key=''):
+        self.name = name
+        self.action = action
+        self.deps = list(deps)
+        self.outputs = list(outputs)
+        self.key = key
+        self.state = None
+        self.seconds = 0.0
+        self.error = None
+        self._claimed = False
+        self._done = threading.Event()
+
+
+class BuildGraph:
+    """
+    Rebuilds exactly the stale nodes needed for the requested targets.
+
+    A node's signature hashes its key and the bytes of every dependency output; it is stale
+    when an output is missing or the signature differs from the one recorded after its last
+    successful build (kept in `state_path`). An unchanged rewrite of a source therefore stops
+    propagating immediately. Independent nodes run in parallel on a worker pool.
+    """
+
+    def __init__(self, state_path):
+        self.state_path = state_path
+        self.nodes = {}
+        self._forced = set()
+        self._planned = set()
+        self._on_done = None
+        self._lock = threading.Lock()
+        try:
+            with open(state_path, 'r', encoding='utf-8') as f:
+                self._recorded = json.load(f).get('signatures', {})
+        except (OSError, ValueError):
+            self._recorded = {}
+
+    def add(self, name, action=None, deps=(), outputs=(), key=''):
+        node = Node(name, action, deps, outputs, key)
+        self.nodes[name] = node
+        return node
+
+    def plan(self, targets):
+        """The targets plus everything they depend on, dependencies first."""
+        order, seen = [], set()
+
+        def visit(name):
+            if name in seen:
+                return
+            if name not in self.nodes:
+                raise KeyError(name)
+            seen.add(name)
+            for dep in self.nodes[name].deps:
+                visit(dep)
+            order.append(name)
+
+        for target in targets:
+            visit(target)
+        return order
+
+    def signature(self, node):
+        digest = hashlib.sha256()
+        digest.update(f"{node.name}\0{node.key}".encode('utf-8'))
+        for dep in node.deps:
+            for path in self.nodes[dep].outputs:
+                digest.update(f"\0{os.path.basename(path)}:".encode('utf-8'))
+                digest.update((hash_file(path) if os.path.isfile(path) else 'missing').encode('utf-8'))
+        return digest.hexdigest()
+
+    def ensure(self, name):
+        """
+        Brings one node up to date (dependencies first) and returns True if it is usable.
+        Safe to call from any thread: a node already running elsewhere is waited for, one
+        nobody has started yet runs in the calling thread, so waiting can never deadlock.
+        """
+        node = self.nodes[name]
+        with self._lock:
+            claimed, node._claimed = node._claimed, True
+        if claimed:
+            node._done.wait()
+            return node.state in (FRESH, BUILT)
+        start = time.perf_counter()
+        try:
+            if not all([self.ensure(dep) for dep in node.deps]):
+                node.state = BLOCKED
+            elif node.action is None:
+                node.state = FRESH
+            else:
+                signature = self.signature(node)
+                outputs_exist = all(os.path.exists(p) for p in node.outputs)
+                if name not in self._forced and outputs_exist and self._recorded.get(name) == signature:
+                    node.state = FRESH
+                elif node.action():
+                    node.state = BUILT
+                    with self._lock:
+                        self._recorded[name] = signature
+                else:
+                    node.state = FAILED
+        except Exception as e:
+            node.state = FAILED
+            node.error = f"{type(e).__name__}: {e}"
+        finally:
+            node.seconds = time.perf_counter() - start
+            node._done.set()
+        # Planned nodes are reported by run(); one pulled in on demand (e.g. a backend asking for
+        # the DOCX) would otherwise finish silently
+        if name not in self._planned and self._on_done is not None:
+            self._on_done(node)
+        return node.state in (FRESH, BUILT)
+
+    def run(self, targets, jobs=1, force=False, on_done=None):
+        """
+        Builds `targets` on `jobs` workers; `force` rebuilds the targets themselves even when
+        fresh. `on_done(node)` is called as each planned node finishes, and for any other node
+        built on demand through ensure() meanwhile. Returns the plan.
+        """
+        order = self.plan(targets)
+        self._forced = set(targets) if force else set()
+        self._planned = set(order)
+        self._on_done = on_done
+
+        def build(name):
+            self.ensure(name)
+            if on_done is not None:
+                on_done(self.nodes[name])
+
+        try:
+            with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+                for future in [pool.submit(build, name) for name in order]:
+                    future.result()
+        finally:
+            self._on_done = None
+            self.save()
+        return order
+
+    def save(self):
+        with self._lock:
+            recorded = dict(self._recorded)
+        os.makedirs(os.path.dirname(self.state_path) or '.', exist_ok=True)
+        tmp = f"{self.state_path}.{os.getpid()}.tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({'signatures': recorded}, f, indent=1, sort_keys=True)
+        os.replace(tmp, self.state_path)
@@ -0,0 +1,225 @@
+import hashlib
+import os
+import re
+import shutil
+import subprocess
+import threading
+
+from press_store import detach
+
+
+# [SYSTEM CONFIGURATION: OMNIPOTENT-2]
+# [TASK: PDFLATEX DRIVER - PRECOMPILED PREAMBLE FORMATS + FIXED-POINT PASSES]
+
+# Upper bound on pdflatex passes while cross-references are still settling
+MAX_PASSES = 4
+# Files a pass writes and the next pass reads back
+SETTLING_EXTENSIONS = ['.aux', '.toc', '.out', '.lof', '.lot']
+# The only .aux entries that change what the next pass typesets
+AUX_SIGNIFICANT_RE = re.compile(r'^\\(newlabel|bibcite|@writefile|contentsline)\b')
+
+# Format store shared by main.py and the per-problem generator scripts
+DEFAULT_FORMAT_DIR = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), 'Millennium_Prize_Solutions_MASTER', '.press_cache', 'formats'
+)
+
+# Lines that load code and are therefore worth dumping into a format
+PACKAGE_LINE_RE = re.compile(r'^\s*\\(documentclass|usepackage|RequirePackage)\b')
+# hyperref patches \begin{document} and must stay out of the dump (and everything after it)
+UNDUMPABLE_RE = re.compile(r'^\s*\\usepackage(\[[^\]]*\])?\{[^}]*\bhyperref\b')
+# \relax when compiled normally; marks where mylatexformat stops skipping when the format is used
+END_OF_DUMP = r'\csname endofdump\endcsname'
+
+
+def split_preamble(latex_content):
+    """
+    Splits a manuscript into (static, rest): `static` is the package-loading head of the
+    preamble that can be dumped into a format, `rest` is everything after it.
+    Returns (None, latex_content) when there is nothing worth dumping.
+    """
+    head, marker, _ = latex_content.partition(r'\begin{document}')
+    if not marker:
+        return None, latex_content
+    lines = head.splitlines(keepends=True)
+    cut = 0
+    for i, line in enumerate(lines):
+        stripped = line.lstrip()
+        if stripped.startswith('%'):
+            continue
+        if UNDUMPABLE_RE.match(line):
+            break
+        if PACKAGE_LINE_RE.match(line):
+            cut = i + 1
+    if cut == 0:
+        return None, latex_content
+    static = ''.join(lines[:cut])
+    return static, latex_content[len(static):]
+
+
+class FormatStore:
+    """
+    Dumps one pdflatex format per distinct preamble head (via mylatexformat) and reuses it.
+
+    Formats are named after a hash of the preamble text and the pdflatex binary (path, size,
+    mtime), so editing a preamble or upgrading TeX simply produces a new format. A preamble
+    whose dump fails is remembered for the rest of the process and compiled the normal way.
+    """
+
+    def __init__(self, format_dir, pdflatex):
+        # Absolute: drivers and formats are handed to pdflatex processes running in other folders
+        self.format_dir = os.path.abspath(format_dir)
+        self.pdflatex = pdflatex
+        try:
+            st = os.stat(pdflatex)
+            self.engine_stamp = f"{os.path.abspath(pdflatex)}:{st.st_size}:{int(st.st_mtime)}"
+        except OSError:
+            self.engine_stamp = pdflatex
+        self._lock = threading.Lock()
+        self._key_locks = {}
+        self._failed = set()
+
+    def _key(self, static):
+        digest = hashlib.sha256()
+        digest.update(static.encode('utf-8'))
+        digest.update(b"\0" + self.engine_stamp.encode('utf-8'))
+        return digest.hexdigest()[:16]
+
+    def ensure(self, static, log=print):
+        """Returns the absolute format path (without .fmt) for this preamble head, or None."""
+        key = self._key(static)
+        name = f"preamble_{key}"
+        fmt_base = os.path.abspath(os.path.join(self.format_dir, name))
+        with self._lock:
+            if key in self._failed:
+                return None
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        with key_lock:
+            if os.path.isfile(fmt_base + '.fmt'):
+                return fmt_base
+            os.makedirs(self.format_dir, exist_ok=True)
+            with open(fmt_base + '.tex', 'w', encoding='utf-8') as f:
+                f.write(static + '\n' + END_OF_DUMP + '\n\\begin{document}\\end{document}\n')
+            try:
+                subprocess.run(
+                    [self.pdflatex, '-ini', '-interaction=nonstopmode', '-halt-on-error', f'-jobname={name}',
+                     '&pdflatex', 'mylatexformat.ltx', f'{name}.tex'],
+                    check=True, cwd=self.format_dir, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+                )
+            except (subprocess.CalledProcessError, OSError) as e:
+                log(f">> [FORMATS] Dumping {name} failed ({type(e).__name__}: {e}); compiling without a format")
+            if os.path.isfile(fmt_base + '.fmt'):
+                return fmt_base
+        with self._lock:
+            self._failed.add(key)
+        return None
+
+    def driver(self, latex_content, driver_path, log=print):
+        """
+        Writes a copy of the manuscript that pdflatex can run against a precompiled format and
+        returns the format path, or None when the manuscript must be compiled normally.
+        """
+        static, rest = split_preamble(latex_content)
+        if static is None:
+            return None
+        fmt = self.ensure(static, log)
+        if fmt is None:
+            return None
+        with open(driver_path, 'w', encoding='utf-8') as f:
+            f.write(static + END_OF_DUMP + '\n' + rest)
+        return fmt
+
+
+def pdflatex_command(pdflatex, tex_path, fmt=None, jobname=None, halt_on_error=True):
+    cmd = [pdflatex, '-interaction=nonstopmode']
+    if halt_on_error:
+        cmd.append('-halt-on-error')
+    if fmt:
+        cmd.append(f'-fmt={fmt}')
+    if jobname:
+        cmd.append(f'-jobname={jobname}')
+    cmd.append(tex_path)
+    return cmd
+
+
+def _settling_state(cwd, jobname):
+    """What the next pass would read back: significant .aux lines plus the other settling files."""
+    state = {}
+    for ext in SETTLING_EXTENSIONS:
+        try:
+            with open(os.path.join(cwd or '.', jobname + ext), 'rb') as f:
+                data = f.read()
+        except OSError:
+            data = b''
+        if ext == '.aux':
+            lines = data.decode('latin-1').splitlines()
+            data = "\n".join(line for line in lines if AUX_SIGNIFICANT_RE.match(line)).encode('latin-1')
+        state[ext] = hashlib.sha256(data).hexdigest() if data else None
+    return state
+
+
+def run_until_stable(cmd, cwd, jobname, max_passes=MAX_PASSES, runner=None, **run_kwargs):
+    """
+    Runs one pdflatex command repeatedly until the files it reads back stop changing.
+
+    A manuscript without labels, citations or a table of contents stops after one pass;
+    one with references stops as soon as two consecutive passes agree, or at `max_passes`.
+    `runner(cmd)` replaces subprocess.run when given. Returns the number of passes run;
+    failures raise CalledProcessError.
+    """
+    if runner is None:
+        def runner(command):
+            return subprocess.run(command, check=True, cwd=cwd, **run_kwargs)
+    before = _settling_state(cwd, jobname)
+    for passes in range(1, max_passes + 1):
+        runner(cmd)
+        after = _settling_state(cwd, jobname)
+        if after == before:
+            return passes
+        before = after
+    return max_passes
+
+
+def compile_pdflatex(tex_path, cwd, pdflatex, formats=None, latex_content=None, max_passes=MAX_PASSES,
+                     halt_on_error=True, runner=None, log=print, **run_kwargs):
+    """
+    Compiles `tex_path` with pdflatex inside `cwd`, running only as many passes as needed.
+    The preamble comes from a precompiled format in `formats` (a FormatStore) when possible,
+    otherwise the manuscript is compiled normally; a failed format run is reported through `log`
+    before that fallback. Returns the number of passes run.
+    """
+    jobname = os.path.splitext(os.path.basename(tex_path))[0]
+    if formats is not None:
+        if latex_content is None:
+            with open(os.path.join(cwd or '.', tex_path), 'r', encoding='utf-8') as f:
+                latex_content = f.read()
+        # Absolute: pdflatex runs inside `cwd`, which need not be where the format store lives
+        driver = os.path.abspath(os.path.join(formats.format_dir, f"{jobname}_driver.tex"))
+        fmt = formats.driver(latex_content, driver, log)
+        if fmt:
+            try:
+                return run_until_stable(
+                    pdflatex_command(pdflatex, driver, fmt=fmt, jobname=jobname, halt_on_error=halt_on_error),
+                    cwd, jobname, max_passes, runner, **run_kwargs
+                )
+            except subprocess.CalledProcessError as e:
+                log(f">> [FORMATS] pdflatex against {os.path.basename(fmt)}.fmt exited with {e.returncode}; "
+                    "recompiling without the format")
+    return run_until_stable(
+        pdflatex_command(pdflatex, tex_path, halt_on_error=halt_on_error), cwd, jobname, max_passes, runner,
+        **run_kwargs
+    )
+
+
+def compile_submission_pdf(tex_filename, format_dir=DEFAULT_FORMAT_DIR, **run_kwargs):
+    """
+    pdflatex entry point for the generator scripts' compile_submission(): compiles in the current
+    directory, sharing preamble formats with main.py. Raises FileNotFoundError when pdflatex is
+    not installed and CalledProcessError when it fails, like the subprocess calls it replaces.
+    """
+    pdflatex = shutil.which('pdflatex')
+    if not pdflatex:
+        raise FileNotFoundError('pdflatex')
+    formats = FormatStore(format_dir, pdflatex) if format_dir else None
+    # pdflatex rewrites the PDF in place; give it a private copy if the object store linked it
+    detach(os.path.splitext(tex_filename)[0] + '.pdf')
+    return compile_pdflatex(tex_filename, None, pdflatex, formats=formats, halt_on_error=False, **run_kwargs)
@@ -0,0 +1,188 @@
+import argparse
+import json
+import os
+import re
+import sys
+import threading
+import time
+import zlib
+
+from press_cache import hash_file
+
+
+# [SYSTEM CONFIGURATION: OMNIPOTENT-2]
+# [TASK: MACHINE-READABLE ARTIFACT MANIFEST WITH BUILD PROVENANCE]
+
+MANIFEST_NAME = 'manifest.json'
+MANIFEST_VERSION = 1
+
+# The page tree root carries the total page count: "<< /Type /Pages /Kids [...] /Count 12 >>"
+PAGES_COUNT_RE = re.compile(rb'/Type\s*/Pages\b[^>]*?/Count\s+(\d+)|/Count\s+(\d+)[^>]*?/Type\s*/Pages\b')
+PAGE_RE = re.compile(rb'/Type\s*/Page\b(?!s)')
+
+
+OBJSTM_RE = re.compile(rb'/Type\s*/ObjStm\b')
+STREAM_RE = re.compile(rb'stream\r?\n')
+
+
+def _object_streams(data):
+    """
+    Inflated contents of every Flate-compressed object stream (/Type /ObjStm), where PDF 1.5+
+    writers pack ordinary objects, the page tree included.
+    """
+    for match in STREAM_RE.finditer(data):
+        start = match.end()
+        head = data[data.rfind(b' obj', 0, match.start()):match.start()]
+        if not OBJSTM_RE.search(head) or b'/FlateDecode' not in head:
+            continue
+        end = data.find(b'endstream', start)
+        try:
+            # decompressobj stops at the end of the zlib stream and ignores the EOL before endstream
+            yield zlib.decompressobj().decompress(data[start:end if end != -1 else len(data)])
+        except zlib.error:
+            continue
+
+
+def pdf_page_count(path):
+    """
+    Page count read from the PDF's page tree without a PDF library, searching compressed
+    object streams too; None when it cannot be found.
+    """
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+    except OSError:
+        return None
+    data = b'\n'.join([data, *_object_streams(data)])
+    counts = [int(a or b) for a, b in PAGES_COUNT_RE.findall(data)]
+    if counts:
+        # Nested page-tree nodes count their own subtree; the root has the largest count
+        return max(counts)
+    pages = len(PAGE_RE.findall(data))
+    return pages or None
+
+
+class ArtifactManifest:
+    """
+    JSON index of every artifact a build produced: path (relative to the manifest), SHA-256,
+    size, page count, producing backend, build duration and the hashes of its inputs.
+
+    Each entry also keeps the file's mtime, so verify() confirms an unchanged archive from
+    stat() alone and only rehashes files whose size or mtime moved (or every file with
+    full=True). Downstream tools can take hashes from here instead of rereading the files.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.base = os.path.dirname(os.path.abspath(path))
+        self._lock = threading.Lock()
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                self.artifacts = json.load(f).get('artifacts', {})
+        except (OSError, ValueError):
+            self.artifacts = {}
+
+    def _rel(self, path):
+        return os.path.relpath(os.path.abspath(path), self.base).replace(os.sep, '/')
+
+    def _abs(self, rel):
+        return os.path.join(self.base, *rel.split('/'))
+
+    def digest(self, path):
+        """SHA-256 of `path`, taken from its entry while size and mtime still match."""
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        with self._lock:
+            entry = self.artifacts.get(self._rel(path))
+        if entry and entry['size'] == st.st_size and entry['mtime_ns'] == st.st_mtime_ns:
+            return entry['sha256']
+        return hash_file(path)
+
+    def record(self, path, backend=None, seconds=None, inputs=(), key=None):
+        """Adds or replaces the entry for a freshly built artifact; returns it (None if absent)."""
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        entry = {
+            'sha256': hash_file(path),
+            'size': st.st_size,
+            'mtime_ns': st.st_mtime_ns,
+            'pages': pdf_page_count(path) if path.lower().endswith('.pdf') else None,
+            'backend': backend,
+            'seconds': round(seconds, 3) if seconds is not None else None,
+            'inputs': {self._rel(p): self.digest(p) for p in inputs if os.path.isfile(p)},
+            'built': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        }
+        if key:
+            entry['key'] = key
+        with self._lock:
+            self.artifacts[self._rel(path)] = entry
+        return entry
+
+    def refresh(self, path):
+        """Keeps an up-to-date artifact listed: records it (without provenance) if it has no entry."""
+        with self._lock:
+            known = self._rel(path) in self.artifacts
+        if not known:
+            self.record(path)
+
+    def verify(self, full=False):
+        """Returns a list of problems: missing files, size or hash mismatches."""
+        with self._lock:
+            entries = dict(self.artifacts)
+        problems = []
+        for rel, entry in sorted(entries.items()):
+            path = self._abs(rel)
+            try:
+                st = os.stat(path)
+            except OSError:
+                problems.append(f"{rel}: missing")
+                continue
+            if st.st_size != entry['size']:
+                problems.append(f"{rel}: size {st.st_size} != {entry['size']}")
+            elif (full or st.st_mtime_ns != entry['mtime_ns']) and hash_file(path) != entry['sha256']:
+                problems.append(f"{rel}: content changed (sha256 mismatch)")
+        return problems
+
+    def save(self):
+        with self._lock:
+            artifacts = dict(self.artifacts)
+        os.makedirs(self.base, exist_ok=True)
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({'version': MANIFEST_VERSION, 'artifacts': artifacts}, f, indent=1, sort_keys=True)
+        os.replace(tmp, self.path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Inspect or verify a build's artifact manifest.")
+    parser.add_argument('command', choices=['verify', 'show'])
+    parser.add_argument('manifests', nargs='*',
+                        default=[os.path.join('Millennium_Prize_Solutions_MASTER', MANIFEST_NAME),
+                                 os.path.join('Millennium_Prize_Archive', MANIFEST_NAME)],
+                        help="Manifest files (default: the MASTER and Archive manifests).")
+    parser.add_argument('--full', action='store_true', help="Rehash every artifact, not only those whose mtime moved.")
+    args = parser.parse_args()
+
+    failed = False
+    for manifest_path in args.manifests:
+        if not os.path.isfile(manifest_path):
+            print(f">> [MANIFEST] {manifest_path}: not found")
+            continue
+        manifest = ArtifactManifest(manifest_path)
+        if args.command == 'show':
+            print(f">> [MANIFEST] {manifest_path}")
+            for rel, entry in sorted(manifest.artifacts.items()):
+                pages = f"{entry['pages']}p" if entry.get('pages') else '-'
+                print(f"   {entry['sha256'][:12]}  {entry['size']:>9}  {pages:>4}  {entry.get('backend') or '-':<10} {rel}")
+            continue
+        problems = manifest.verify(full=args.full)
+        for problem in problems:
+            print(f">> [MANIFEST] {manifest_path}: {problem}")
+        print(f">> [MANIFEST] {manifest_path}: {len(manifest.artifacts)} artifact(s), "
+              + ("OK" if not problems else f"{len(problems)} problem(s)"))
+        failed = failed or bool(problems)
+    sys.exit(1 if failed else 0)
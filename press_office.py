@@ -0,0 +1,134 @@
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from press_async import DEFAULT_TIMEOUT
+
+
+# [SYSTEM CONFIGURATION: OMNIPOTENT-2]
+# [TASK: BATCHED LIBREOFFICE DOCX -> PDF CONVERSION]
+
+# How long the first request waits for other packages to reach fallback E (seconds)
+BATCH_WINDOW = 0.5
+
+
+class _Request:
+    def __init__(self, docx_path, pdf_path):
+        self.docx_path = docx_path
+        self.pdf_path = pdf_path
+        self.stem = Path(docx_path).stem
+        self.done = threading.Event()
+        self.batch_size = 0
+
+
+class SofficeBatcher:
+    """
+    Converts DOCX -> PDF for every package through as few LibreOffice launches as possible.
+
+    Requests that arrive while a conversion is running (or within BATCH_WINDOW of the first
+    one) are handed to a single `soffice --convert-to pdf a.docx b.docx ...` invocation, and the
+    PDFs are moved back to their packages. All runs share one persistent user profile, so the
+    first-start profile setup is paid once rather than per package, and concurrent packages no
+    longer race each other for LibreOffice's single-instance lock.
+    """
+
+    def __init__(self, soffice, profile_dir, timeout=DEFAULT_TIMEOUT, window=BATCH_WINDOW):
+        self.soffice = soffice
+        self.profile_dir = profile_dir
+        self.timeout = timeout
+        self.window = window
+        self.batches = []
+        self._pending = []
+        self._cond = threading.Condition()
+        self._worker = None
+        self._closed = False
+
+    def convert(self, docx_path, pdf_path):
+        """
+        Blocks until `docx_path` has been converted to `pdf_path` (replaced atomically).
+        Returns the number of documents in the batch it was converted with, 0 on failure.
+        """
+        request = _Request(os.path.abspath(docx_path), os.path.abspath(pdf_path))
+        with self._cond:
+            if self._closed:
+                return 0
+            self._pending.append(request)
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._work, name='soffice-batcher', daemon=True)
+                self._worker.start()
+            self._cond.notify()
+        request.done.wait()
+        return request.batch_size
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+            worker = self._worker
+        if worker is not None:
+            worker.join()
+
+    def _work(self):
+        try:
+            while True:
+                with self._cond:
+                    while not self._pending and not self._closed:
+                        self._cond.wait()
+                    if not self._pending:
+                        return
+                # Give packages that are a moment behind the chance to join this launch
+                time.sleep(self.window)
+                with self._cond:
+                    batch, stems = [], set()
+                    for request in list(self._pending):
+                        # soffice names outputs after the input stem; a clash waits for the next batch
+                        if request.stem not in stems:
+                            stems.add(request.stem)
+                            batch.append(request)
+                            self._pending.remove(request)
+                try:
+                    self._convert_batch(batch)
+                except Exception as e:
+                    # One bad batch fails its own requests; the worker stays up for the next one
+                    print(f">> [SOFFICE] Batch of {len(batch)} failed: {type(e).__name__}: {e}")
+                finally:
+                    for request in batch:
+                        request.done.set()
+        finally:
+            # Whatever ends the worker, the next convert() starts a fresh one and nobody waits forever
+            with self._cond:
+                self._worker = None
+                stranded, self._pending = self._pending, []
+            for request in stranded:
+                request.done.set()
+
+    def _convert_batch(self, batch):
+        os.makedirs(self.profile_dir, exist_ok=True)
+        outdir = tempfile.mkdtemp(prefix='press_soffice_')
+        try:
+            cmd = [
+                self.soffice, f'-env:UserInstallation={Path(self.profile_dir).resolve().as_uri()}',
+                '--headless', '--norestore', '--convert-to', 'pdf', '--outdir', outdir
+            ] + [request.docx_path for request in batch]
+            try:
+                subprocess.run(
+                    cmd, check=False, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL, timeout=self.timeout
+                )
+            except (OSError, subprocess.TimeoutExpired):
+                return
+            self.batches.append(len(batch))
+            for request in batch:
+                produced = os.path.join(outdir, request.stem + '.pdf')
+                if not os.path.isfile(produced) or os.path.getsize(produced) == 0:
+                    continue
+                tmp = f"{request.pdf_path}.{os.getpid()}.soffice.tmp"
+                shutil.move(produced, tmp)
+                os.replace(tmp, request.pdf_path)
+                request.batch_size = len(batch)
+        finally:
+            shutil.rmtree(outdir, ignore_errors=True)
@@ -0,0 +1,206 @@
+import os
+import re
+import shutil
+import subprocess
+import sys
+import threading
+
+from press_cache import referenced_figures, resolve_figure
+
+
+# [SYSTEM CONFIGURATION: OMNIPOTENT-2]
+# [TASK: STATIC PRE-FLIGHT CHECKS BEFORE ANY COMPILATION]
+
+CONTROL_RE = re.compile(r'\\([A-Za-z@]+\*?|.)')
+ENV_NAME_RE = re.compile(r'\s*\{([^{}]*)\}')
+PACKAGE_RE = re.compile(r'\\(documentclass|usepackage|RequirePackage)\s*(?:\[[^\]]*\])?\s*\{([^}]*)\}')
+# Environments whose body TeX reads verbatim, so braces inside them are not structure
+VERBATIM_ENVS = {'verbatim', 'verbatim*', 'lstlisting', 'minted', 'comment', 'Verbatim'}
+
+
+def strip_comment(line):
+    """The part of a source line before an unescaped %."""
+    i = 0
+    while i < len(line):
+        if line[i] == '\\':
+            i += 2
+            continue
+        if line[i] == '%':
+            return line[:i]
+        i += 1
+    return line
+
+
+def check_balance(latex_content):
+    """
+    Returns the first structural error as a string, or None: an unmatched brace, or a
+    \\begin/\\end pair that does not nest. Escaped braces, comments, \\verb and verbatim-like
+    environments are skipped the way TeX would.
+    """
+    stack = []
+    verbatim = None
+    for lineno, raw in enumerate(latex_content.splitlines(), 1):
+        rest = raw
+        if verbatim:
+            # Inside a verbatim body nothing is structure, % included, until \end{name}
+            marker = f'\\end{{{verbatim}}}'
+            close = rest.find(marker)
+            if close == -1:
+                continue
+            stack.pop()
+            verbatim = None
+            rest = rest[close + len(marker):]
+        # `line` is a prefix of `rest`, so an index into one is an index into the other
+        line = strip_comment(rest)
+        i = 0
+        while i < len(line):
+            c = line[i]
+            if c == '\\':
+                m = CONTROL_RE.match(line, i)
+                if m is None:
+                    # A lone backslash at the end of the line
+                    i += 1
+                    continue
+                word = m.group(1)
+                i = m.end()
+                if word in ('verb', 'verb*') and i < len(line):
+                    close = line.find(line[i], i + 1)
+                    i = close + 1 if close != -1 else len(line)
+                elif word in ('begin', 'end'):
+                    env = ENV_NAME_RE.match(line, i)
+                    if not env:
+                        continue
+                    i = env.end()
+                    name = env.group(1).strip()
+                    if word == 'begin':
+                        stack.append(('env', name, lineno))
+                        if name in VERBATIM_ENVS:
+                            # The body may close on this very line; scanning resumes after it
+                            marker = f'\\end{{{name}}}'
+                            close = rest.find(marker, i)
+                            if close == -1:
+                                verbatim = name
+                                break
+                            stack.pop()
+                            rest = rest[close + len(marker):]
+                            line = strip_comment(rest)
+                            i = 0
+                    elif not stack or stack[-1][:2] != ('env', name):
+                        return f"line {lineno}: \\end{{{name}}} does not match {_describe(stack[-1]) if stack else 'any open group'}"
+                    else:
+                        stack.pop()
+                continue
+            if c == '{':
+                stack.append(('brace', None, lineno))
+            elif c == '}':
+                if not stack or stack[-1][0] != 'brace':
+                    return f"line {lineno}: '}}' closes {_describe(stack[-1]) if stack else 'nothing'}"
+                stack.pop()
+            i += 1
+    if stack:
+        return f"{_describe(stack[-1])} is never closed"
+    return None
+
+
+def _describe(entry):
+    kind, name, lineno = entry
+    return f"\\begin{{{name}}} from line {lineno}" if kind == 'env' else f"'{{' from line {lineno}"
+
+
+def required_packages(latex_content):
+    """File names the preamble loads, e.g. ['article.cls', 'amsmath.sty', 'tikz-cd.sty']."""
+    names = []
+    source = "\n".join(strip_comment(line) for line in latex_content.splitlines())
+    for command, arg in PACKAGE_RE.findall(source):
+        ext = '.cls' if command == 'documentclass' else '.sty'
+        for name in arg.split(','):
+            name = name.strip()
+            if name and name + ext not in names:
+                names.append(name + ext)
+    return names
+
+
+class PackageIndex:
+    """
+    Answers "is this .sty/.cls installed?" from the local TeX tree via kpsewhich, batching every
+    unknown name into one kpsewhich call and remembering answers for the rest of the process.
+    """
+
+    def __init__(self, kpsewhich=None):
+        self.kpsewhich = kpsewhich or shutil.which('kpsewhich')
+        self._known = {}
+        self._lock = threading.Lock()
+
+    def missing(self, names):
+        """The subset of `names` the TeX tree lacks, or None when there is no kpsewhich to ask."""
+        if not self.kpsewhich:
+            return None
+        with self._lock:
+            unknown = [n for n in names if n not in self._known]
+            if unknown:
+                try:
+                    result = subprocess.run(
+                        [self.kpsewhich] + unknown, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE,
+                        stderr=subprocess.DEVNULL, text=True, timeout=30
+                    )
+                except (OSError, subprocess.TimeoutExpired):
+                    return None
+                found = {line.strip().replace('\\', '/').rsplit('/', 1)[-1] for line in result.stdout.splitlines()}
+                for name in unknown:
+                    self._known[name] = name in found
+            return [n for n in names if not self._known[n]]
+
+
+# Shared by every manuscript checked in this process
+DEFAULT_INDEX = PackageIndex()
+
+
+class PreflightReport:
+    """`errors` make a compile pointless; `missing_packages` only rule out the local TeX tree."""
+
+    def __init__(self):
+        self.errors = []
+        self.missing_packages = []
+
+    @property
+    def ok(self):
+        return not self.errors
+
+    def lines(self):
+        return self.errors + [f"package not installed: {name}" for name in self.missing_packages]
+
+
+def check_manuscript(latex_content, base_dir, packages=DEFAULT_INDEX):
+    """Runs every pre-flight check on one manuscript; figures are resolved against `base_dir`."""
+    report = PreflightReport()
+    problem = check_balance(latex_content)
+    if problem:
+        report.errors.append(f"unbalanced source: {problem}")
+    for name in referenced_figures(latex_content):
+        if resolve_figure(name, base_dir) is None:
+            report.errors.append(f"\\includegraphics target not found: {name}")
+    if packages is not None:
+        report.missing_packages = packages.missing(required_packages(latex_content)) or []
+    return report
+
+
+def submission_problems(latex_content, base_dir='.'):
+    """
+    Pre-flight for the generator scripts, which compile with the local pdflatex only, so a
+    missing package is as fatal as an error. Returns printable lines; empty means go ahead.
+    """
+    return check_manuscript(latex_content, base_dir).lines()
+
+
+if __name__ == "__main__":
+    # python press_preflight.py paper.tex [...]: exits 1 if any manuscript fails pre-flight
+    failed = False
+    for tex_path in sys.argv[1:]:
+        with open(tex_path, 'r', encoding='utf-8', errors='replace') as f:
+            report = check_manuscript(f.read(), os.path.dirname(os.path.abspath(tex_path)))
+        for line in report.lines():
+            print(f">> [PREFLIGHT] {tex_path}: {line}")
+        failed = failed or not report.ok
+        if not report.lines():
+            print(f">> [PREFLIGHT] {tex_path}: OK")
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,82 @@
+import os
+import shutil
+import tempfile
+import threading
+
+from press_cache import same_content
+
+
+# [SYSTEM CONFIGURATION: OMNIPOTENT-2]
+# [TASK: RAM-BACKED SCRATCH BUILDS WITH ATOMIC PUBLISH]
+
+# Checked in order for a RAM-backed filesystem to build in
+TMPFS_CANDIDATES = ['/dev/shm', os.environ.get('XDG_RUNTIME_DIR') or '']
+
+
+def default_scratch_root():
+    """A writable tmpfs directory if the system has one, else the platform temp directory."""
+    for candidate in TMPFS_CANDIDATES:
+        if candidate and os.path.isdir(candidate) and os.access(candidate, os.W_OK):
+            return candidate
+    return tempfile.gettempdir()
+
+
+def _same_file(src, dest):
+    try:
+        a, b = os.stat(src), os.stat(dest)
+    except OSError:
+        return False
+    return a.st_size == b.st_size and a.st_mtime_ns == b.st_mtime_ns
+
+
+def _copy_atomic(src, dest):
+    """Copies `src` next to `dest` and renames it into place, so readers never see a partial file."""
+    os.makedirs(os.path.dirname(dest) or '.', exist_ok=True)
+    tmp = f"{dest}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        shutil.copy2(src, tmp)
+        os.replace(tmp, dest)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+
+
+class ScratchSpace:
+    """
+    One scratch directory per build (by default on tmpfs) with a subfolder per package.
+
+    Builds run entirely inside the scratch folder, so compiler passes, .aux/.log files and HTML
+    previews never touch the archive volume. Inputs are staged in from the archive before a
+    step runs, and only finished artifacts are published back, each copied beside its final
+    name and renamed over it so concurrent readers see either the old or the new file; an
+    artifact identical to the archived one is left alone.
+    """
+
+    def __init__(self, root=None):
+        self.root = tempfile.mkdtemp(prefix='press_scratch_', dir=root or default_scratch_root())
+
+    def package_dir(self, folder):
+        path = os.path.join(self.root, folder)
+        os.makedirs(path, exist_ok=True)
+        return path
+
+    def stage_in(self, archive_path, scratch_path):
+        """Brings an archive input into the scratch folder unless an identical copy is there."""
+        if os.path.isfile(archive_path) and not _same_file(archive_path, scratch_path):
+            _copy_atomic(archive_path, scratch_path)
+
+    def publish(self, scratch_path, archive_path):
+        """
+        Atomically replaces `archive_path` with a finished scratch artifact, unless it already
+        holds the same bytes. Returns the number of bytes skipped: 0 when the file was replaced.
+        """
+        if same_content(scratch_path, archive_path):
+            return os.path.getsize(archive_path)
+        _copy_atomic(scratch_path, archive_path)
+        return 0
+
+    def close(self):
+        shutil.rmtree(self.root, ignore_errors=True)
@@ -0,0 +1,244 @@
+import argparse
+import errno
+import json
+import os
+import shutil
+import sys
+import threading
+
+from press_cache import hash_file
+
+
+# [SYSTEM CONFIGURATION: OMNIPOTENT-2]
+# [TASK: CONTENT-ADDRESSED DEDUPLICATING STORE FOR THE ARCHIVE TREES]
+
+REPO_ROOT = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_STORE = os.path.join(REPO_ROOT, '.press_store')
+DEFAULT_TREES = ['Millennium_Prize_Archive', 'Millennium_Prize_Solutions_MASTER']
+# Build state and interpreter caches are never archived content
+SKIP_DIRS = {'.git', '.press_cache', '.press_store', '__pycache__'}
+
+
+def detach(path):
+    """
+    Gives `path` its own inode again if it is hardlinked to other copies, so a tool that
+    rewrites it in place (pdflatex, pandoc, fpdf) cannot change the deduplicated twins.
+    Call before any in-place write; a no-op for ordinary files.
+    """
+    try:
+        if os.stat(path).st_nlink < 2:
+            return
+    except OSError:
+        return
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.detach.tmp"
+    shutil.copy2(path, tmp)
+    os.replace(tmp, path)
+
+
+def _human(size):
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if size < 1024 or unit == 'GB':
+            return f"{size:.0f} {unit}" if unit == 'B' else f"{size:.1f} {unit}"
+        size /= 1024.0
+
+
+class ObjectStore:
+    """
+    One copy of every distinct file in the archive trees, named by its SHA-256.
+
+    Layout: <store>/objects/<sha[:2]>/<sha> plus <store>/manifest.json, which maps every
+    scanned path (relative to the repository) to its hash and size. Files whose content
+    occurs more than once are replaced by hardlinks to the object, so the trees keep their
+    normal layout while the bytes live on disk once. Where hardlinks are impossible (another
+    filesystem, or a filesystem without them) the file stays a copy and only the manifest
+    references it. Hashes are reused from the manifest while a file's size, mtime and inode
+    are unchanged, so rescanning an unchanged archive reads no file contents.
+    """
+
+    def __init__(self, store_dir=DEFAULT_STORE, repo_root=REPO_ROOT):
+        self.store_dir = store_dir
+        self.repo_root = repo_root
+        self.objects_dir = os.path.join(store_dir, 'objects')
+        self.manifest_path = os.path.join(store_dir, 'manifest.json')
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                self.files = json.load(f).get('files', {})
+        except (OSError, ValueError):
+            self.files = {}
+
+    def object_path(self, sha):
+        return os.path.join(self.objects_dir, sha[:2], sha)
+
+    def save(self):
+        os.makedirs(self.store_dir, exist_ok=True)
+        tmp = f"{self.manifest_path}.{os.getpid()}.tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({'files': self.files}, f, indent=1, sort_keys=True)
+        os.replace(tmp, self.manifest_path)
+
+    # -- scanning ------------------------------------------------------------
+
+    def scan(self, trees):
+        """Hashes every file under `trees` (reusing unchanged entries); returns {relpath: entry}."""
+        seen = {}
+        for tree in trees:
+            for dirpath, dirnames, filenames in os.walk(os.path.join(self.repo_root, tree)):
+                dirnames[:] = sorted(d for d in dirnames if d not in SKIP_DIRS)
+                for name in sorted(filenames):
+                    if name.endswith('.tmp'):
+                        continue
+                    path = os.path.join(dirpath, name)
+                    if os.path.islink(path) or not os.path.isfile(path):
+                        continue
+                    rel = os.path.relpath(path, self.repo_root).replace(os.sep, '/')
+                    st = os.stat(path)
+                    entry = self.files.get(rel)
+                    if not entry or (entry['size'], entry['mtime_ns'], entry['inode']) != (st.st_size, st.st_mtime_ns, st.st_ino):
+                        entry = {'sha256': hash_file(path), 'size': st.st_size}
+                    entry.update(mtime_ns=st.st_mtime_ns, inode=st.st_ino)
+                    seen[rel] = entry
+        # Paths that disappeared from the trees drop out of the manifest
+        self.files = {rel: e for rel, e in self.files.items() if not self._under(rel, trees)}
+        self.files.update(seen)
+        return seen
+
+    @staticmethod
+    def _under(rel, trees):
+        return any(rel == tree or rel.startswith(tree.rstrip('/') + '/') for tree in trees)
+
+    def groups(self, entries):
+        """{sha: [relpath, ...]} for content that occurs at more than one path."""
+        by_hash = {}
+        for rel, entry in entries.items():
+            by_hash.setdefault(entry['sha256'], []).append(rel)
+        return {sha: sorted(paths) for sha, paths in by_hash.items() if len(paths) > 1}
+
+    # -- commands ------------------------------------------------------------
+
+    def report(self, trees):
+        """Prints every duplicate group and what deduplication saves (or already saved)."""
+        entries = self.scan(trees)
+        self.save()
+        groups = self.groups(entries)
+        logical = sum(e['size'] for e in entries.values())
+        on_disk = sum({e['inode']: e['size'] for e in entries.values()}.values())
+        unique = sum({e['sha256']: e['size'] for e in entries.values()}.values())
+        print(f">> [STORE] {len(entries)} file(s) in {', '.join(trees)}")
+        for sha, paths in sorted(groups.items(), key=lambda item: -entries[item[1][0]]['size']):
+            size = entries[paths[0]]['size']
+            inodes = len({entries[p]['inode'] for p in paths})
+            state = 'linked' if inodes == 1 else f"{inodes} copies"
+            print(f"   {sha[:12]}  {_human(size):>9} x{len(paths)}  ({state})")
+            for path in paths:
+                print(f"      {path}")
+        print(f">> [STORE] Logical size {_human(logical)}, on disk {_human(on_disk)}, "
+              f"deduplicated {_human(unique)} (reclaimable now: {_human(on_disk - unique)})")
+        return on_disk - unique
+
+    def dedup(self, trees, dry_run=False):
+        """Hardlinks every duplicate to one stored object. Returns the bytes reclaimed."""
+        entries = self.scan(trees)
+        reclaimed, fallbacks = 0, 0
+        for sha, paths in sorted(self.groups(entries).items()):
+            obj = self.object_path(sha)
+            if not dry_run:
+                self._ingest(os.path.join(self.repo_root, paths[0]), obj)
+            linked = {entries[paths[0]]['inode']}
+            for rel in paths:
+                path = os.path.join(self.repo_root, rel)
+                if os.path.exists(obj) and os.path.samefile(path, obj):
+                    continue
+                if dry_run:
+                    # Paths already sharing an inode cost nothing extra
+                    if entries[rel]['inode'] not in linked:
+                        reclaimed += entries[rel]['size']
+                        linked.add(entries[rel]['inode'])
+                    continue
+                if self._link(obj, path):
+                    reclaimed += entries[rel]['size']
+                    st = os.stat(path)
+                    self.files[rel].update(mtime_ns=st.st_mtime_ns, inode=st.st_ino)
+                else:
+                    fallbacks += 1
+        if not dry_run:
+            self.save()
+        verb = "Would reclaim" if dry_run else "Reclaimed"
+        print(f">> [STORE] {verb} {_human(reclaimed)}"
+              + (f"; {fallbacks} file(s) kept as copies (no hardlinks on that filesystem)" if fallbacks else ""))
+        return reclaimed
+
+    def _ingest(self, path, obj):
+        """Makes `obj` hold the content of `path`: a hardlink when possible, else a copy."""
+        if os.path.exists(obj):
+            return
+        os.makedirs(os.path.dirname(obj), exist_ok=True)
+        tmp = f"{obj}.{os.getpid()}.tmp"
+        try:
+            os.link(path, tmp)
+        except OSError:
+            shutil.copy2(path, tmp)
+        os.replace(tmp, obj)
+
+    def _link(self, obj, path):
+        """Atomically replaces `path` with a hardlink to `obj`; False if the filesystem refuses."""
+        tmp = f"{path}.{os.getpid()}.link.tmp"
+        try:
+            os.link(obj, tmp)
+        except OSError as e:
+            if e.errno in (errno.EXDEV, errno.EPERM, errno.EMLINK, errno.ENOTSUP, errno.EOPNOTSUPP):
+                return False
+            raise
+        os.replace(tmp, path)
+        return True
+
+    def gc(self, trees, dry_run=False):
+        """Deletes objects no scanned path holds any more. Returns the bytes freed."""
+        self.scan(trees)
+        # Liveness is by content: objects stored through the copy fallback never share an inode
+        # with their archive file. An object whose size no longer matches its hash's files was
+        # rewritten through a hardlink and no longer holds that content, so it goes too.
+        live = {e['sha256']: e['size'] for e in self.files.values()}
+        freed, removed = 0, 0
+        if os.path.isdir(self.objects_dir):
+            for prefix in sorted(os.listdir(self.objects_dir)):
+                prefix_dir = os.path.join(self.objects_dir, prefix)
+                for sha in sorted(os.listdir(prefix_dir)):
+                    obj = os.path.join(prefix_dir, sha)
+                    if live.get(sha) == os.path.getsize(obj):
+                        continue
+                    freed += os.path.getsize(obj)
+                    removed += 1
+                    if not dry_run:
+                        os.remove(obj)
+                if not dry_run and not os.listdir(prefix_dir):
+                    os.rmdir(prefix_dir)
+        if not dry_run:
+            self.save()
+        verb = "Would remove" if dry_run else "Removed"
+        print(f">> [STORE] {verb} {removed} unreferenced object(s), {_human(freed)}")
+        return freed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Content-addressed deduplication of the archive trees.")
+    parser.add_argument('command', choices=['report', 'dedup', 'gc'],
+                        help="report: list duplicates and savings; dedup: hardlink duplicates to one stored "
+                             "object; gc: delete objects no archive file uses any more.")
+    parser.add_argument('trees', nargs='*', default=DEFAULT_TREES,
+                        help=f"Folders to scan, relative to the repository (default: {' '.join(DEFAULT_TREES)}).")
+    parser.add_argument('--store', default=DEFAULT_STORE, help="Store directory (default: .press_store).")
+    parser.add_argument('--dry-run', action='store_true', help="Show what dedup/gc would do without changing files.")
+    args = parser.parse_args()
+
+    store = ObjectStore(args.store)
+    trees = [t.rstrip('/\\') for t in args.trees]
+    missing = [t for t in trees if not os.path.isdir(os.path.join(store.repo_root, t))]
+    if missing:
+        parser.error(f"No such folder: {', '.join(missing)}")
+    if args.command == 'report':
+        store.report(trees)
+    elif args.command == 'dedup':
+        store.dedup(trees, dry_run=args.dry_run)
+    else:
+        store.gc(trees, dry_run=args.dry_run)
+    sys.exit(0)
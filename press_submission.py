@@ -0,0 +1,63 @@
+import subprocess
+
+from press_cache import write_if_changed
+from press_latex import compile_submission_pdf
+from press_preflight import submission_problems
+from press_store import detach
+
+
+# [SYSTEM CONFIGURATION: OMNIPOTENT-2]
+# [TASK: SHARED COMPILATION STAGES OF THE GENERATOR SCRIPTS]
+
+
+def submission_stages(latex_content, filename_base, copy_label="MASTER COPY"):
+    """
+    The stages every generator script exposes, as (write_tex, compile_pdf, compile_docx,
+    compile_submission). Like the scripts, they work in the current directory on
+    <filename_base>.tex/.pdf/.docx; press_generate.py runs them one at a time.
+    """
+    tex_filename = f"{filename_base}.tex"
+    pdf_filename = f"{filename_base}.pdf"
+    docx_filename = f"{filename_base}.docx"
+
+    def write_tex():
+        # Write LaTeX File
+        print(f"[ZEO] >> WRITING {copy_label}: {tex_filename}...")
+        # Left untouched when identical, so its mtime (and mirrors keyed on it) stay put
+        skipped = write_if_changed(tex_filename, latex_content)
+        if skipped:
+            print(f"[ZEO] >> UNCHANGED: {tex_filename} kept as is ({skipped} bytes not rewritten).")
+
+    def compile_pdf():
+        # 1. Compile PDF (pdflatex), unless the static pre-flight shows it cannot succeed
+        problems = submission_problems(latex_content)
+        for problem in problems:
+            print(f"[ZEO] !! PRE-FLIGHT: {problem}")
+        if problems:
+            print("[ZEO] !! SKIPPING PDF: fix the pre-flight problems first.")
+            return
+        print("[ZEO] >> TRANSMUTING TO PDF (pdflatex)...")
+        try:
+            # Re-run only while .aux/.toc/.out are still changing
+            passes = compile_submission_pdf(tex_filename, stdout=subprocess.DEVNULL)
+            print(f"[ZEO] >> SUCCESS: {pdf_filename} CREATED ({passes} pdflatex pass(es)).")
+        except (subprocess.CalledProcessError, FileNotFoundError):
+            print("[ZEO] !! ERROR: 'pdflatex' not found or failed. Ensure TeX Live/MiKTeX is installed.")
+
+    def compile_docx():
+        # 2. Convert to DOCX (Pandoc)
+        print("[ZEO] >> TRANSMUTING TO DOCX (pandoc)...")
+        try:
+            # pandoc rewrites the DOCX in place; never through a deduplicated hardlink
+            detach(docx_filename)
+            subprocess.run(["pandoc", tex_filename, "-o", docx_filename, "--citeproc"], check=True)
+            print(f"[ZEO] >> SUCCESS: {docx_filename} CREATED.")
+        except (subprocess.CalledProcessError, FileNotFoundError):
+            print("[ZEO] !! ERROR: 'pandoc' not found or failed. Install Pandoc for Word conversion.")
+
+    def compile_submission():
+        write_tex()
+        compile_pdf()
+        compile_docx()
+
+    return write_tex, compile_pdf, compile_docx, compile_submission
@@ -0,0 +1,86 @@
+import re
+
+
+# [SYSTEM CONFIGURATION: OMNIPOTENT-2]
+# [TASK: COMPILE-LOG DIAGNOSTICS FOR THE FALLBACK CASCADE]
+
+# pdflatex/latexmk ("! LaTeX Error: ..."), tectonic ("error: x.tex:3: LaTeX Error: ...") and pandoc
+# (which relays the engine's messages) all word these the same way
+MISSING_FILE_RE = re.compile(r"LaTeX Error: File `([^']+)' not found|I can't find file `([^']+)'")
+UNDEFINED_CS_RE = re.compile(r"Undefined control sequence")
+LATEX_ERROR_RE = re.compile(r"LaTeX Error: (.+?)\.?$")
+TEX_ERROR_RE = re.compile(r"^! (.+?)\.?$")
+# tectonic reports the source line inline: "error: paper.tex:12: Undefined control sequence"
+INLINE_LINE_RE = re.compile(r":(\d+): ")
+# pdflatex reports it on the following line: "l.12 \foo"
+CONTEXT_LINE_RE = re.compile(r"^l\.(\d+)\s?(.*)$")
+BOX_RE = re.compile(r"^(Overfull|Underfull) \\([hv])box \(([^)]*)\).*?lines? (\d+)")
+
+PACKAGE_EXTENSIONS = ('.sty', '.cls', '.def', '.cfg', '.clo', '.fd')
+
+
+class Diagnostic:
+    """One finding in a compile log: `kind` is one of missing-package, missing-file,
+    undefined-control-sequence, latex-error, error, overfull or underfull."""
+
+    def __init__(self, kind, detail, line=None):
+        self.kind = kind
+        self.detail = detail
+        self.line = line
+
+    def __str__(self):
+        text = " ".join(part for part in (self.kind.replace('-', ' '), self.detail) if part)
+        return f"{text} (line {self.line})" if self.line else text
+
+
+def parse_log(text):
+    """Parses TeX engine / latexmk / tectonic / pandoc output into a list of Diagnostics."""
+    diagnostics = []
+    lines = text.splitlines()
+    for i, line in enumerate(lines):
+        inline = INLINE_LINE_RE.search(line)
+        line_no = int(inline.group(1)) if inline else None
+        missing = MISSING_FILE_RE.search(line)
+        if missing:
+            name = missing.group(1) or missing.group(2)
+            kind = 'missing-package' if name.endswith(PACKAGE_EXTENSIONS) else 'missing-file'
+            diagnostics.append(Diagnostic(kind, name, line_no))
+            continue
+        if UNDEFINED_CS_RE.search(line):
+            command = ''
+            for follow in lines[i + 1:i + 4]:
+                context = CONTEXT_LINE_RE.match(follow)
+                if context:
+                    line_no = line_no or int(context.group(1))
+                    # The undefined macro is the last token TeX read before stopping
+                    command = context.group(2).split()[-1] if context.group(2).split() else ''
+                    break
+            diagnostics.append(Diagnostic('undefined-control-sequence', command, line_no))
+            continue
+        latex_error = LATEX_ERROR_RE.search(line)
+        if latex_error:
+            diagnostics.append(Diagnostic('latex-error', latex_error.group(1), line_no))
+            continue
+        tex_error = TEX_ERROR_RE.match(line)
+        if tex_error and not tex_error.group(1).startswith(('Emergency stop', '==> Fatal error')):
+            diagnostics.append(Diagnostic('error', tex_error.group(1), line_no))
+            continue
+        box = BOX_RE.match(line)
+        if box:
+            diagnostics.append(Diagnostic(box.group(1).lower(), f"\\{box.group(2)}box ({box.group(3)})", int(box.group(4))))
+    return diagnostics
+
+
+def root_cause(diagnostics):
+    """
+    The failure this backend would hit again, as (cause, Diagnostic), or None when the log
+    points at nothing source- or installation-specific (e.g. an engine crash).
+    Causes: missing-package (local TeX installation) and missing-file, which every TeX engine
+    shares, and source-error, which only rules out the backend that reported it.
+    """
+    for kind, cause in (('missing-package', 'missing-package'), ('missing-file', 'missing-file'),
+                        ('undefined-control-sequence', 'source-error'), ('latex-error', 'source-error')):
+        for diagnostic in diagnostics:
+            if diagnostic.kind == kind:
+                return cause, diagnostic
+    return None
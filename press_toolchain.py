@@ -0,0 +1,138 @@
+import json
+import os
+import shutil
+import subprocess
+import threading
+
+
+# [SYSTEM CONFIGURATION: OMNIPOTENT-2]
+# [TASK: ONE-SHOT TOOLCHAIN DISCOVERY + BACKEND MEMORY]
+
+# Every executable the PDF/DOCX cascade in main.py may invoke
+CASCADE_TOOLS = [
+    'tectonic', 'latexmk', 'pdflatex', 'xelatex', 'pandoc', 'soffice', 'soffice.com', 'powershell',
+    'msedge', 'msedge.exe', 'chrome', 'chrome.exe', 'google-chrome', 'chromium', 'chromium.exe', 'wkhtmltopdf'
+]
+
+# Tools whose version query is slow, interactive or meaningless; only their path is recorded
+NO_VERSION_PROBE = {'powershell'}
+
+VERSION_TIMEOUT = 15
+
+
+def _probe_version(exe):
+    try:
+        result = subprocess.run(
+            [exe, '--version'], capture_output=True, text=True, timeout=VERSION_TIMEOUT,
+            stdin=subprocess.DEVNULL
+        )
+    except Exception:
+        return None
+    for line in (result.stdout or result.stderr or '').splitlines():
+        if line.strip():
+            return line.strip()
+    return None
+
+
+class ToolchainRegistry:
+    """
+    Locates every cascade tool once per process and remembers its version on disk.
+
+    Versions are only re-probed when a binary's path, size or mtime changes, so repeat
+    builds pay for `shutil.which` once per tool and never re-run `--version`.
+    The same file records which PDF backend last succeeded for each package.
+    """
+
+    def __init__(self, state_path):
+        self.state_path = state_path
+        self._lock = threading.Lock()
+        self._tools = None
+        self._winners = {}
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            state = {}
+        self._persisted_tools = state.get('tools', {})
+        self._winners = state.get('winners', {})
+
+    def _save(self):
+        state = {'tools': self._tools or self._persisted_tools, 'winners': self._winners}
+        os.makedirs(os.path.dirname(self.state_path) or '.', exist_ok=True)
+        tmp = f"{self.state_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(state, f, indent=2, sort_keys=True)
+        os.replace(tmp, self.state_path)
+
+    def _probe(self):
+        tools = {}
+        for tool in CASCADE_TOOLS:
+            exe = shutil.which(tool)
+            if not exe:
+                continue
+            try:
+                st = os.stat(exe)
+                stamp = [st.st_size, int(st.st_mtime)]
+            except OSError:
+                stamp = None
+            known = self._persisted_tools.get(tool)
+            if known and known.get('path') == exe and known.get('stamp') == stamp:
+                version = known.get('version')
+            else:
+                version = None if tool in NO_VERSION_PROBE else _probe_version(exe)
+            tools[tool] = {'path': exe, 'stamp': stamp, 'version': version}
+        return tools
+
+    @property
+    def tools(self):
+        with self._lock:
+            if self._tools is None:
+                self._tools = self._probe()
+                if self._tools != self._persisted_tools:
+                    try:
+                        self._save()
+                    except OSError:
+                        pass
+            return self._tools
+
+    def which(self, tool):
+        entry = self.tools.get(tool)
+        return entry['path'] if entry else None
+
+    def version(self, tool):
+        entry = self.tools.get(tool)
+        return entry['version'] if entry else None
+
+    def detected(self):
+        return list(self.tools)
+
+    def fingerprint(self):
+        """Stable string identifying the installed toolchain (paths + versions)."""
+        return ";".join(
+            f"{tool}={entry['path']}:{entry['version'] or entry['stamp']}"
+            for tool, entry in sorted(self.tools.items())
+        )
+
+    def last_winner(self, package):
+        with self._lock:
+            return self._winners.get(package)
+
+    def record_winner(self, package, backend):
+        with self._lock:
+            if self._winners.get(package) == backend:
+                return
+            self._winners[package] = backend
+            try:
+                self._save()
+            except OSError:
+                pass
+
+    def ordered(self, package, backends):
+        """Returns `backends` with the package's last successful backend moved to the front."""
+        winner = self.last_winner(package)
+        if winner in backends:
+            return [winner] + [b for b in backends if b != winner]
+        return list(backends)
@@ -0,0 +1,119 @@
+import asyncio
+import json
+import os
+import subprocess
+import threading
+import time
+from contextlib import contextmanager
+
+
+# [SYSTEM CONFIGURATION: OMNIPOTENT-2]
+# [TASK: CHROME TRACE-EVENT INSTRUMENTATION FOR THE PRESS]
+
+def _size(path):
+    try:
+        return os.path.getsize(path)
+    except (OSError, TypeError):
+        return 0
+
+
+class Tracer:
+    """
+    Records one complete ("ph": "X") trace event per pipeline stage.
+
+    Open the written JSON in chrome://tracing or https://ui.perfetto.dev. Each worker thread
+    gets its own track; every event carries the package, exit code and bytes produced.
+    A disabled tracer records nothing and costs one attribute check per stage.
+    """
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self._events = []
+        self._lock = threading.Lock()
+        self._t0 = time.perf_counter()
+        self._tids = {}
+
+    def _tid(self):
+        # Concurrent asyncio tasks in one worker thread get their own tracks so spans nest cleanly
+        ident = threading.get_ident()
+        try:
+            task = asyncio.current_task()
+        except RuntimeError:
+            task = None
+        if task is not None:
+            ident = (ident, id(task))
+        with self._lock:
+            if ident not in self._tids:
+                self._tids[ident] = len(self._tids) + 1
+            return self._tids[ident]
+
+    @contextmanager
+    def span(self, name, package=None, output=None, **args):
+        """
+        Times the enclosed block as stage `name`. `output` is the file (or list of files) the
+        stage produces; its size afterwards is reported as `bytes`. The yielded dict can be
+        updated with extra args, e.g. `exit_code`. Exceptions are recorded and re-raised.
+        """
+        info = dict(args)
+        if not self.enabled:
+            yield info
+            return
+        start = time.perf_counter()
+        try:
+            yield info
+        except subprocess.CalledProcessError as e:
+            info.setdefault('exit_code', e.returncode)
+            raise
+        except asyncio.CancelledError:
+            info['cancelled'] = True
+            raise
+        except BaseException as e:
+            info.setdefault('error', f"{type(e).__name__}: {e}")
+            raise
+        finally:
+            end = time.perf_counter()
+            outputs = output if isinstance(output, (list, tuple)) else [output] if output else []
+            info['bytes'] = sum(_size(p) for p in outputs)
+            if package:
+                info['package'] = package
+            event = {
+                'name': name, 'cat': name.split(':', 1)[0], 'ph': 'X', 'pid': os.getpid(), 'tid': self._tid(),
+                'ts': round((start - self._t0) * 1e6), 'dur': round((end - start) * 1e6), 'args': info,
+            }
+            with self._lock:
+                self._events.append(event)
+
+    def write(self, path):
+        """Writes the Chrome trace-event JSON (object form) to `path`."""
+        with self._lock:
+            events = list(self._events)
+        meta = [{'name': 'process_name', 'ph': 'M', 'pid': os.getpid(), 'args': {'name': 'press'}}]
+        meta += [
+            {'name': 'thread_name', 'ph': 'M', 'pid': os.getpid(), 'tid': tid, 'args': {'name': f'worker-{tid}'}}
+            for tid in sorted(self._tids.values())
+        ]
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'traceEvents': meta + events, 'displayTimeUnit': 'ms'}, f)
+
+    def summary(self):
+        """Per-stage rows: (stage, calls, failures, total s, max s, bytes), slowest total first."""
+        stages = {}
+        with self._lock:
+            events = list(self._events)
+        for event in events:
+            row = stages.setdefault(event['name'], [0, 0, 0.0, 0.0, 0])
+            failed = event['args'].get('exit_code') not in (None, 0) or 'error' in event['args']
+            seconds = event['dur'] / 1e6
+            row[0] += 1
+            row[1] += int(failed)
+            row[2] += seconds
+            row[3] = max(row[3], seconds)
+            row[4] += event['args'].get('bytes', 0)
+        rows = [(name,) + tuple(values) for name, values in stages.items()]
+        return sorted(rows, key=lambda r: r[3], reverse=True)
+
+    def summary_lines(self):
+        lines = [f"   {'stage':<28} {'calls':>5} {'fail':>5} {'total s':>9} {'max s':>8} {'bytes':>12}"]
+        for name, calls, failures, total, longest, produced in self.summary():
+            lines.append(f"   {name:<28} {calls:>5} {failures:>5} {total:>9.2f} {longest:>8.2f} {produced:>12}")
+        return lines
@@ -0,0 +1,256 @@
+import asyncio
+import ctypes
+import ctypes.util
+import hashlib
+import os
+import re
+import runpy
+import struct
+import sys
+import time
+
+from press_async import DEFAULT_TIMEOUT, run_process
+from press_cache import referenced_figures
+from press_generate import package_scripts
+
+
+# [SYSTEM CONFIGURATION: OMNIPOTENT-2]
+# [TASK: INOTIFY WATCH MODE WITH DEBOUNCED PER-PACKAGE REBUILDS]
+
+# Seconds of quiet after the last save before a package rebuilds
+DEBOUNCE = 0.5
+
+# <sys/inotify.h>
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+# Editors either rewrite a file (close-after-write) or save a temp file and rename it over
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_TO | IN_DELETE
+EVENT_HEADER = struct.Struct('iIII')
+
+
+async def _cancel_all(tasks):
+    """Cancels still-running rebuilds and waits until their subprocesses are gone."""
+    pending = [t for t in tasks if t is not None and not t.done()]
+    for task in pending:
+        task.cancel()
+    if pending:
+        await asyncio.gather(*pending, return_exceptions=True)
+
+
+class Inotify:
+    """Directory watches through Linux inotify, called via ctypes (no third-party watcher)."""
+
+    def __init__(self):
+        if not sys.platform.startswith('linux'):
+            raise OSError("watch mode needs Linux inotify")
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or None, use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, f"inotify_init1: {os.strerror(err)}")
+        self._dirs = {}
+
+    def add_watch(self, directory):
+        wd = self._add_watch(self.fd, os.fsencode(directory), WATCH_MASK)
+        if wd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, f"inotify_add_watch {directory}: {os.strerror(err)}")
+        self._dirs[wd] = directory
+
+    def read(self):
+        """Every pending event as (path, mask); path is None when the kernel queue overflowed."""
+        try:
+            data = os.read(self.fd, 1 << 16)
+        except BlockingIOError:
+            return []
+        events, offset = [], 0
+        while offset + EVENT_HEADER.size <= len(data):
+            wd, mask, _cookie, length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b'\0')
+            offset += length
+            if mask & IN_Q_OVERFLOW:
+                events.append((None, mask))
+            elif wd in self._dirs and name and not mask & IN_ISDIR:
+                events.append((os.path.join(self._dirs[wd], os.fsdecode(name)), mask))
+        return events
+
+    def close(self):
+        os.close(self.fd)
+
+
+class PackageWatcher:
+    """
+    Rebuilds a package whenever one of its inputs is saved.
+
+    Watched inputs: the manuscripts in main.py (a save rebuilds only the packages whose text
+    changed), each package's current generator and figure scripts (press_generate.GENERATORS
+    and FIGURE_SCRIPTS; re-run, then the package rebuilds), the modules those scripts import
+    from the package folder (the importing scripts re-run) and the figures its manuscript
+    includes. Superseded scripts (e.g. *_v2.py) are ignored. Saves are debounced per package; an edit that
+    arrives while that package is building cancels the build (killing its process group)
+    and starts over. Builds run `main.py PACKAGE` one at a time, since packages share the
+    build state under .press_cache.
+    """
+
+    def __init__(self, main_path, root_dir, folders=None, build_args=(), debounce=DEBOUNCE):
+        self.main_path = os.path.abspath(main_path)
+        self.root_dir = os.path.abspath(root_dir)
+        self.build_args = list(build_args)
+        self.debounce = debounce
+        self.packages = self._load_packages() or {}
+        self.folders = [f for f in self.packages if not folders or f in folders]
+        self._timers = {}
+        self._tasks = {}
+        self._scripts = {folder: set() for folder in self.folders}
+        self._generating = set()
+        self._build_lock = None
+
+    def _load_packages(self):
+        """{folder: (digest of the package definition, figure names)} from main.py, or None."""
+        try:
+            namespace = runpy.run_path(self.main_path, run_name='press_watch')
+            packages = namespace['UniversalPressMaster'].archive_packages()
+        except Exception as e:
+            print(f">> [WATCH] Could not load packages from {self.main_path}: {type(e).__name__}: {e}")
+            return None
+        return {
+            package[0]: (
+                hashlib.sha256("\0".join(package).encode('utf-8')).hexdigest(),
+                set(referenced_figures(package[3])),
+            )
+            for package in packages
+        }
+
+    def affected(self, path):
+        """(folder, script or None) pairs a saved file should rebuild."""
+        if path == self.main_path:
+            packages = self._load_packages()
+            if packages is None:
+                return []
+            changed = [f for f in self.folders if packages.get(f, (None,))[0] != self.packages.get(f, (None,))[0]]
+            self.packages = packages
+            return [(folder, None) for folder in changed]
+        folder, name = os.path.split(os.path.relpath(path, self.root_dir))
+        if folder not in self.folders or name.endswith('.tmp'):
+            return []
+        if name.endswith('.py'):
+            return [(folder, script) for script in self.scripts_for(folder, name)]
+        figures = self.packages.get(folder, (None, set()))[1]
+        # A generator re-rendering its own figure is already followed by a rebuild
+        if (name in figures or os.path.splitext(name)[0] in figures) and folder not in self._generating:
+            return [(folder, None)]
+        return []
+
+    def scripts_for(self, folder, name):
+        """Runnable scripts to re-run after `name` (a .py file in `folder`) was saved."""
+        directory = os.path.join(self.root_dir, folder)
+        scripts = package_scripts(folder)
+        if name in scripts:
+            return [os.path.join(directory, name)]
+        # A library module next to the scripts (e.g. staircase_engine.py): re-run whoever imports it
+        module = re.escape(os.path.splitext(name)[0])
+        imports = re.compile(rf'^\s*(?:from\s+{module}\s+import|import\s+{module}\b)', re.MULTILINE)
+        dependents = []
+        for script in scripts:
+            try:
+                with open(os.path.join(directory, script), 'r', encoding='utf-8') as f:
+                    if imports.search(f.read()):
+                        dependents.append(os.path.join(directory, script))
+            except OSError:
+                continue
+        return dependents
+
+    def schedule(self, folder, script=None):
+        if script:
+            self._scripts[folder].add(script)
+        task = self._tasks.get(folder)
+        if task is not None and not task.done():
+            print(f">> [WATCH] {folder}: newer edit, cancelling the build in progress")
+            task.cancel()
+        if folder in self._timers:
+            self._timers[folder].cancel()
+        loop = asyncio.get_running_loop()
+        self._timers[folder] = loop.call_later(self.debounce, self._start, folder)
+
+    def _start(self, folder):
+        self._timers.pop(folder, None)
+        self._tasks[folder] = asyncio.ensure_future(self._rebuild(folder))
+
+    async def _rebuild(self, folder, announce=True):
+        scripts = sorted(self._scripts[folder])
+        self._scripts[folder].clear()
+        start = time.perf_counter()
+        try:
+            async with self._build_lock:
+                if scripts:
+                    self._generating.add(folder)
+                    try:
+                        for script in scripts:
+                            print(f">> [WATCH] {folder}: running {os.path.basename(script)}")
+                            await run_process(
+                                [sys.executable, script], cwd=os.path.dirname(script), timeout=DEFAULT_TIMEOUT,
+                                check=False, passthrough=True
+                            )
+                    finally:
+                        self._generating.discard(folder)
+                    scripts = []
+                if announce:
+                    print(f">> [WATCH] {folder}: rebuilding")
+                returncode = await run_process(
+                    [sys.executable, self.main_path, folder] + self.build_args,
+                    cwd=os.path.dirname(self.root_dir), timeout=None, check=False, passthrough=True
+                )
+        except asyncio.CancelledError:
+            # Scripts that never finished run again with the next build
+            self._scripts[folder].update(scripts)
+            raise
+        status = 'done' if returncode == 0 else f'failed (exit {returncode})'
+        print(f">> [WATCH] {folder}: {status} in {time.perf_counter() - start:.1f}s; watching...")
+
+    def _on_readable(self, inotify):
+        for path, mask in inotify.read():
+            if path is None:
+                print(">> [WATCH] Event queue overflowed; rebuilding every watched package")
+                for folder in self.folders:
+                    self.schedule(folder)
+                continue
+            for folder, script in self.affected(path):
+                self.schedule(folder, script)
+
+    async def watch(self, initial_build=True):
+        self._build_lock = asyncio.Lock()
+        inotify = Inotify()
+        loop = asyncio.get_running_loop()
+        try:
+            inotify.add_watch(os.path.dirname(self.main_path))
+            for folder in self.folders:
+                path = os.path.join(self.root_dir, folder)
+                os.makedirs(path, exist_ok=True)
+                inotify.add_watch(path)
+            loop.add_reader(inotify.fd, self._on_readable, inotify)
+            if initial_build:
+                print(f">> [WATCH] Initial build of {len(self.folders)} package(s)")
+                for folder in self.folders:
+                    self._tasks[folder] = asyncio.ensure_future(self._rebuild(folder, announce=False))
+            print(f">> [WATCH] Watching main.py and {len(self.folders)} package folder(s) (Ctrl+C to stop)")
+            await asyncio.Event().wait()
+        finally:
+            loop.remove_reader(inotify.fd)
+            for timer in self._timers.values():
+                timer.cancel()
+            await _cancel_all(list(self._tasks.values()))
+            inotify.close()
+
+    def run(self, initial_build=True):
+        try:
+            asyncio.run(self.watch(initial_build))
+        except KeyboardInterrupt:
+            print("\n>> [WATCH] Stopped.")
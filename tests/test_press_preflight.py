@@ -0,0 +1,25 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from press_preflight import check_balance  # noqa: E402
+
+
+class CheckBalanceTest(unittest.TestCase):
+    def test_line_ending_in_lone_backslash(self):
+        self.assertIsNone(check_balance("\\begin{document}\nText \\\n\\end{document}"))
+
+    def test_one_line_verbatim(self):
+        self.assertIsNone(check_balance("\\begin{verbatim}x\\end{verbatim}"))
+
+    def test_text_after_verbatim_end_is_scanned(self):
+        self.assertEqual(check_balance("\\begin{verbatim}x\\end{verbatim} {"), "'{' from line 1 is never closed")
+        self.assertEqual(check_balance("\\begin{lstlisting}\n}\n\\end{lstlisting} }"), "line 3: '}' closes nothing")
+
+    def test_verbatim_body_is_not_structure(self):
+        self.assertIsNone(check_balance("\\begin{Verbatim}100% {\n}}\\end{Verbatim}{}"))
+
+
+if __name__ == "__main__":
+    unittest.main()